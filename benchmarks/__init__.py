@@ -0,0 +1,6 @@
+"""
+Benchmarks for the public coralia API.
+
+    python -m benchmarks run [--max-size N] [--only NAME ...] [--out FILE]
+    python -m benchmarks compare [FILE] [--base RUN] [--head RUN]
+"""
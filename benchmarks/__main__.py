@@ -0,0 +1,61 @@
+import argparse
+import sys
+
+from .runner import append_history, compare, load_history, run_suite
+from .suite import cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and append to the history file")
+    run.add_argument("--out", default="bench_history.jsonl")
+    run.add_argument("--max-size", type=float, default=1e7)
+    run.add_argument("--only", nargs="*", choices=sorted(cases))
+    run.add_argument("--budget", type=float, default=1.0, help="seconds per (case, size)")
+    run.add_argument("--limit", type=float, default=10.0, help="stop a case above this latency")
+
+    cmp = commands.add_parser("compare", help="flag regressions between two runs")
+    cmp.add_argument("history", nargs="?", default="bench_history.jsonl")
+    cmp.add_argument("--base", help="run_id (default: second to last)")
+    cmp.add_argument("--head", help="run_id (default: last)")
+    cmp.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        def log(r):
+            print(f"{r['case']:>20} n={r['size']:<9} p50={r['p50'] * 1e3:10.3f}ms "
+                  f"p99={r['p99'] * 1e3:10.3f}ms {r['throughput']:14.0f}/s "
+                  f"peak={r['peak_bytes'] / 1e6:8.2f}MB", flush=True)
+        record = run_suite(int(args.max_size), args.only, args.budget, args.limit, log)
+        append_history(args.out, record)
+        print(f"run {record['run_id']} appended to {args.out}")
+        return 0
+
+    try:
+        history = load_history(args.history)
+    except FileNotFoundError:
+        print(f"no history file {args.history}; run 'python -m benchmarks run' first",
+              file=sys.stderr)
+        return 2
+    runs = {r["run_id"]: r for r in history}
+    if len(history) < 2 and not (args.base and args.head):
+        print("need two runs to compare", file=sys.stderr)
+        return 2
+    base = runs[args.base] if args.base else history[-2]
+    head = runs[args.head] if args.head else history[-1]
+    rows = compare(base, head, args.threshold)
+    for case, size, before, after, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{case:>20} n={size:<9} {before * 1e3:10.3f}ms -> {after * 1e3:10.3f}ms "
+              f"x{ratio:5.2f} {flag}")
+    regressions = sum(row[-1] for row in rows)
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%} "
+          f"({base['run_id']} -> {head['run_id']})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
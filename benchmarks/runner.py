@@ -0,0 +1,110 @@
+"""Timing, memory measurement, history storage and comparison."""
+
+import json
+import math
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import coralia
+from coralia._compat import numpy
+
+from .suite import cases
+
+
+def sizes(max_size):
+    """10, 100, ... up to max_size."""
+    n = 10
+    while n <= max_size:
+        yield n
+        n *= 10
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def measure(setup, n, min_repeats=5, budget=1.0):
+    """
+    Latency percentiles, throughput (items/s) and peak traced memory of
+    one case at one size. Repeats until min_repeats and budget seconds.
+    """
+    run = setup(n)
+    run()  # warm up
+    times = []
+    start = time.perf_counter()
+    while len(times) < min_repeats or time.perf_counter() - start < budget:
+        t0 = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t0)
+        if len(times) >= 1000:
+            break
+    times.sort()
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    p50 = percentile(times, 50)
+    return {"size": n, "repeats": len(times), "p50": p50,
+            "p90": percentile(times, 90), "p99": percentile(times, 99),
+            "throughput": n / p50 if p50 else float("inf"), "peak_bytes": peak}
+
+
+def run_suite(max_size=10**7, only=None, budget=1.0, limit=10.0, log=None):
+    """
+    Benchmark every case from size 10 up to its own cap and max_size.
+    A case stops growing once one call takes longer than `limit` seconds.
+    Returns a history record.
+    """
+    results = []
+    for name, (setup, cap) in cases.items():
+        if only and name not in only:
+            continue
+        for n in sizes(min(cap, max_size)):
+            result = {"case": name, **measure(setup, n, budget=budget)}
+            results.append(result)
+            if log:
+                log(result)
+            if result["p50"] > limit:
+                break
+    np = numpy()
+    return {
+        "run_id": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "version": coralia.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__ if np is not None else None,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def append_history(path, record):
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def load_history(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(base, head, threshold=0.10):
+    """
+    Rows of (case, size, base p50, head p50, ratio, regressed) for every
+    (case, size) measured in both runs. Regressed means head is slower by
+    more than `threshold` (a fraction).
+    """
+    before = {(r["case"], r["size"]): r["p50"] for r in base["results"]}
+    rows = []
+    for r in head["results"]:
+        key = (r["case"], r["size"])
+        if key not in before:
+            continue
+        ratio = r["p50"] / before[key] if before[key] else float("inf")
+        rows.append((*key, before[key], r["p50"], ratio, ratio > 1 + threshold))
+    return rows
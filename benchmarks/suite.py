@@ -0,0 +1,72 @@
+"""Benchmark cases: one per public function, parametrized by input size."""
+
+import random
+from array import array
+from functools import partial
+
+import coralia
+from coralia import C
+from coralia._compat import numpy
+
+
+def _values(n, seed=0):
+    rng = random.Random(seed)
+    return array("d", (rng.uniform(0, 35) for _ in range(n)))
+
+
+def _ints(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(0, 35) for _ in range(n)]
+
+
+def _candidates(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        row = list(C)
+        row[rng.randrange(12)] = rng.randint(0, 35)
+        rows.append(row)
+    return rows
+
+
+def _candidate_matrix(n, seed=0):
+    """_candidates as an (n, 12) array built in place, when NumPy is there."""
+    np = numpy()
+    if np is None:
+        return _candidates(n, seed)
+    rng = np.random.default_rng(seed)
+    rows = np.tile(np.array(C, dtype=np.int64), (n, 1))
+    rows[np.arange(n), rng.integers(0, 12, n)] = rng.integers(0, 36, n)
+    return rows
+
+
+def _loop(fn, items):
+    def run():
+        for x in items:
+            fn(x)
+    return run
+
+
+def _stream(data):
+    def run():
+        coralia.CoherenceStream(window=256).push_many(data)
+    return run
+
+
+# name -> (setup(n) returning a zero-argument callable, largest size)
+cases = {
+    "detect_zone": (lambda n: _loop(coralia.detect_zone, _values(n)), 10**7),
+    "detect_zones": (lambda n: partial(coralia.detect_zones, _values(n)), 10**7),
+    "gap_match": (lambda n: partial(coralia.gap_match, _values(n)), 10**7),
+    "rolling_gap_match": (lambda n: partial(coralia.rolling_gap_match, _values(n), 64), 10**6),
+    "find_gap_pattern": (lambda n: partial(coralia.find_gap_pattern, _values(n)), 10**7),
+    "coherence_score": (lambda n: partial(coralia.coherence_score, _ints(n)), 10**7),
+    "CoherenceStream": (lambda n: _stream(_ints(n)), 10**6),
+    "detect_crossings": (lambda n: partial(coralia.detect_crossings, _values(n), band=0.5), 10**7),
+    "check_axioms": (lambda n: _loop(coralia.check_axioms, _candidates(n)), 10**6),
+    "check_axioms_batch": (lambda n: partial(coralia.check_axioms_batch, _candidate_matrix(n)), 10**6),
+    "null_test": (lambda n: partial(coralia.null_test, C, n, seed=0), 10**6),
+    "solve_axioms": (lambda n: lambda: sum(1 for _ in coralia.solve_axioms(n, n // 2, seed=())), 10**4),
+    "verify_uniqueness": (lambda n: coralia.verify_uniqueness, 10),
+    "generate": (lambda n: coralia.generate, 10),
+}
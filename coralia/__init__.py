@@ -4,14 +4,24 @@ A logic kernel for reasoning about stability, collapse, and rhythm in any system
 https://doi.org/10.5281/zenodo.18121786
 """
 
-from .sequence import C, gaps, zones, convergence_points, generate
-from .verify import verify_uniqueness, check_axioms
-from .tools import detect_zone, gap_match, coherence_score
+from .sequence import C, gaps, zones, convergence_points, generate, iter_zones
+from .verify import (verify_uniqueness, check_axioms, check_axioms_batch,
+                     solve_axioms)
+from .tools import (detect_zone, detect_zones, gap_match, rolling_gap_match,
+                    find_gap_pattern, coherence_score)
+from .results import gap_match_batch, coherence_score_batch
+from .stream import CoherenceStream
+from .null import null_test
+from .crossing import CrossingDetector, detect_crossings
+from . import instrument
 
 __version__ = "1.1.0"
 
 __all__ = [
-    "C", "gaps", "zones", "convergence_points", "generate",
-    "verify_uniqueness", "check_axioms",
-    "detect_zone", "gap_match", "coherence_score"
+    "C", "gaps", "zones", "convergence_points", "generate", "iter_zones",
+    "verify_uniqueness", "check_axioms", "check_axioms_batch", "solve_axioms",
+    "detect_zone", "detect_zones", "gap_match", "rolling_gap_match",
+    "find_gap_pattern", "coherence_score", "gap_match_batch",
+    "coherence_score_batch", "CoherenceStream", "null_test",
+    "CrossingDetector", "detect_crossings"
 ]
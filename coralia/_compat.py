@@ -0,0 +1,34 @@
+"""Optional dependencies."""
+
+import os
+from array import array
+
+_numpy = False
+
+
+def numpy():
+    """
+    Return the numpy module, or None if it is not installed or
+    CORALIA_BACKEND=python.
+    """
+    global _numpy
+    if _numpy is False:
+        np = None
+        if os.environ.get("CORALIA_BACKEND", "").lower() != "python":
+            try:
+                import numpy as np
+            except ImportError:
+                pass
+        _numpy = np
+    return _numpy
+
+
+def scalars(values):
+    """
+    `values` ready for a Python loop. NumPy arrays become lists, since
+    their elements are slow to touch one at a time; array.array,
+    memoryview and other buffers are used in place, without a copy.
+    """
+    if hasattr(values, "tolist") and not isinstance(values, (array, memoryview)):
+        return values.tolist()
+    return values
@@ -0,0 +1,57 @@
+"""
+Compute backends.
+
+    python  pure Python, always available
+    numpy   NumPy kernels, picked automatically when NumPy is installed
+
+Backends are imported on first use, so `import coralia` never loads
+NumPy. Set CORALIA_BACKEND=python, or call use("python"), to force the
+pure-Python path everywhere.
+
+Every backend provides detect_zones, gap_match, coherence_score,
+check_axioms_batch, the row-wise gap_columns and coherence_columns
+(and their score-only gap_scores and coherence_scores), with identical
+results.
+"""
+
+import importlib
+
+from .. import _compat
+
+names = ("python", "numpy")
+
+_loaded = {}
+
+
+def get(name):
+    """Backend module by name."""
+    if name not in names:
+        raise ValueError(f"backend must be one of {names}")
+    if name not in _loaded:
+        _loaded[name] = importlib.import_module(f"._{name}", __name__)
+    return _loaded[name]
+
+
+def active():
+    """The backend currently in use."""
+    return get("python" if _compat.numpy() is None else "numpy")
+
+
+def available():
+    """Names of the backends that can be loaded here."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return ["python"]
+    return list(names)
+
+
+def use(name):
+    """Switch every coralia function to the named backend."""
+    if name == "python":
+        _compat._numpy = None
+    elif name == "numpy":
+        import numpy
+        _compat._numpy = numpy
+    else:
+        raise ValueError(f"backend must be one of {names}")
@@ -0,0 +1,202 @@
+"""NumPy backend."""
+
+import numpy as np
+
+from .. import instrument as _inst
+from ..sequence import C, gaps
+from ..tools import (zone_bounds, norm_gaps, _gap_score, _gap_match,
+                     _coherence_score, _interpret, _interpret_code, _widen)
+from ..verify import fib_luc
+
+name = "numpy"
+
+# Below this many values a plain list is faster in pure Python
+min_size = 256
+
+
+def detect_zones(values, ceiling=35):
+    timer = _inst.Timer("detect_zones") if _inst.enabled else None
+    v = np.asarray(values)
+    c = np.asarray(ceiling)
+    if c.ndim and c.shape != v.shape:
+        raise ValueError(f"{c.size} ceilings for {v.size} values")
+    if (c == 0).any():
+        raise ValueError("ceiling must be non-zero")
+    if c.ndim == 0:
+        if ceiling != 35:
+            v = (v / c) * 35
+    else:
+        v = np.where(c != 35, (v / c) * 35, v)
+    if timer:
+        timer.lap("scale")
+    zones = (np.searchsorted(zone_bounds, v) + 1).astype(np.int8)
+    if timer:
+        timer.lap("search")
+    return zones
+
+
+def gap_match(sequence, presorted=False):
+    if len(sequence) < min_size and not isinstance(sequence, np.ndarray):
+        return _gap_match(sequence, presorted)
+    if len(sequence) < 2:
+        return {"score": 0, "error": "Sequence too short"}
+
+    timer = _inst.Timer("gap_match") if _inst.enabled else None
+    # asarray shares memory with buffer input; only the sort (or a
+    # widening of narrow dtypes) copies
+    s = _widen(np.asarray(sequence))
+    if not presorted:
+        s = np.sort(s)
+    if timer:
+        timer.lap("sort")
+    g = np.diff(s)
+    top = g.max().item()
+
+    if top == 0:
+        return {"score": 0, "error": "No variation"}
+
+    # The first 11 gaps as Python numbers, so the arithmetic is _gap_score's
+    score = _gap_score(g[:len(norm_gaps)].tolist(), top)
+    if timer:
+        timer.lap("normalize")
+
+    return {
+        "score": round(score, 3),
+        "input_gaps": g.tolist(),
+        "coralia_gaps": gaps
+    }
+
+
+_nested_gap_match = _inst.instrumented(gap_match, "gap_match")
+
+
+def coherence_score(data, presorted=False):
+    if len(data) < min_size and not isinstance(data, np.ndarray):
+        return _coherence_score(data, presorted)
+    if not len(data):
+        return {"score": 0, "interpretation": "No data"}
+
+    timer = _inst.Timer("coherence_score") if _inst.enabled else None
+    values = np.asarray(data)
+    element_score = int(np.isin(values, C).sum()) / len(values)
+    if timer:
+        timer.lap("elements")
+
+    gap_result = _nested_gap_match(values, presorted) if len(values) > 1 else {"score": 0}
+    gap_score = gap_result.get("score", 0)
+    if timer:
+        timer.lap("gap_match")
+
+    combined = (element_score + gap_score) / 2
+
+    return {
+        "score": round(combined, 3),
+        "element_score": round(element_score, 3),
+        "gap_score": round(gap_score, 3),
+        "interpretation": _interpret(combined)
+    }
+
+
+def gap_columns(m):
+    """
+    gap_match of every row of a 2-D array, as two columns: the rounded
+    score and a status code (0 ok, 1 too short, 2 no variation).
+    """
+    m = _widen(np.asarray(m))
+    n = m.shape[1]
+    if n < 2:
+        return np.zeros(len(m)), np.ones(len(m), dtype=np.int8)
+    g = np.diff(np.sort(m, axis=1), axis=1)
+    top = g.max(axis=1)
+    live = top != 0
+    top = np.where(live, top, 1)
+    # Column by column, so the sum runs in the same order as _gap_score
+    min_len = min(n - 1, len(norm_gaps))
+    diff = np.zeros(len(m))
+    for i in range(min_len):
+        diff += np.abs(g[:, i] / top - norm_gaps[i])
+    score = np.where(live, np.maximum(0, 1 - diff / min_len), 0)
+    status = np.where(live, 0, 2).astype(np.int8)
+    return np.array([round(x, 3) for x in score.tolist()]), status
+
+
+def coherence_columns(m):
+    """
+    coherence_score of every row of a 2-D array, as four columns:
+    score, element_score, gap_score and interpretation code.
+    """
+    m = np.asarray(m)
+    if not m.shape[1]:
+        return (np.zeros(len(m)), np.zeros(len(m)), np.zeros(len(m)),
+                np.zeros(len(m), dtype=np.int8))
+    element = np.isin(m, C).sum(axis=1) / m.shape[1]
+    gap = gap_columns(m)[0]
+    combined = (element + gap) / 2
+    code = _interpret_code(combined).astype(np.int8)
+    return (np.array([round(x, 3) for x in combined.tolist()]),
+            np.array([round(x, 3) for x in element.tolist()]), gap, code)
+
+
+def gap_scores(m):
+    """Rounded gap_match score of every row of a 2-D array."""
+    return gap_columns(m)[0]
+
+
+def coherence_scores(m):
+    """Rounded coherence_score of every row of a 2-D array."""
+    return coherence_columns(m)[0]
+
+
+def check_axioms_batch(candidates, per_axiom=False, short_circuit=False):
+    m = _widen(np.asarray(candidates))
+    if m.ndim != 2 or m.shape[1] != 12:
+        raise ValueError("Length must be 12")
+    s = np.sort(m, axis=1)
+    n = len(s)
+    table = np.zeros(19, dtype=bool)
+    table[sorted(fib_luc(18))] = True
+    seed = [1, 2, 3, 5, 7, 9, 15]
+
+    def vocabulary(g):
+        return ((g == 1) | (g == 2) | (g == 3)).all(axis=1)
+
+    def terminal_fib_luc(t):
+        if np.issubdtype(t.dtype, np.integer):
+            return (table[np.clip(t, 0, 18)] & (t <= 18)).all(axis=1)
+        return np.isin(t, np.flatnonzero(table)).all(axis=1)
+
+    axioms = [
+        lambda s, g: s[:, 0] == 0,
+        lambda s, g: (s == 12).any(axis=1),
+        lambda s, g: np.ones(len(s), dtype=bool),
+        lambda s, g: s[:, -1] == 35,
+        lambda s, g: g.sum(axis=1) == 35,
+        lambda s, g: vocabulary(g[:, :8]),
+        lambda s, g: (np.diff(g[:, :8], axis=1) >= 0).all(axis=1),
+        lambda s, g: np.logical_and.reduce([(s == v).any(axis=1) for v in seed]),
+        lambda s, g: (g[:, 8] > g[:, 9]) & (g[:, 9] > g[:, 10]),
+        lambda s, g: terminal_fib_luc(g[:, 8:]),
+        lambda s, g: (g[:, 8:] >= 5).all(axis=1),
+    ]
+
+    if not short_circuit:
+        g = np.diff(s, axis=1)
+        results = np.column_stack([axiom(s, g) for axiom in axioms])
+        return results if per_axiom else results.all(axis=1)
+
+    results = np.zeros((n, len(axioms)), dtype=bool)
+    alive, g = np.arange(n), None
+    for i, axiom in enumerate(axioms):
+        if i == 4:
+            g = np.diff(s, axis=1)
+        ok = axiom(s, g)
+        results[alive, i] = ok
+        alive, s = alive[ok], s[ok]
+        g = None if g is None else g[ok]
+        if not len(alive):
+            break
+    if per_axiom:
+        return results
+    mask = np.zeros(n, dtype=bool)
+    mask[alive] = True
+    return mask
@@ -0,0 +1,64 @@
+"""Pure-Python backend: the reference implementations."""
+
+from array import array
+
+from .._compat import scalars
+from ..sequence import C
+from ..tools import (_detect_zones as detect_zones, _gap_match as gap_match,
+                     _coherence_score as coherence_score, _gap_score,
+                     _interpret_code)
+from ..verify import _check_axioms_batch as check_axioms_batch
+
+name = "python"
+
+
+def gap_columns(rows):
+    """
+    gap_match of every row, as two columns: the rounded score and a
+    status code (0 ok, 1 too short, 2 no variation).
+    """
+    score, status = array("d"), array("b")
+    for row in rows:
+        s = sorted(scalars(row))
+        g = [s[i+1] - s[i] for i in range(len(s) - 1)]
+        if not g:
+            value, code = 0, 1
+        elif max(g) == 0:
+            value, code = 0, 2
+        else:
+            value, code = round(_gap_score(g, max(g)), 3), 0
+        score.append(value)
+        status.append(code)
+    return score, status
+
+
+def coherence_columns(rows):
+    """
+    coherence_score of every row, as four columns: score,
+    element_score, gap_score and interpretation code (0 for no data).
+    """
+    c_set = set(C)
+    score, element, gap, code = array("d"), array("d"), array("d"), array("b")
+    rows = list(rows)
+    for row, g in zip(rows, gap_columns(rows)[0]):
+        if not len(row):
+            for column in (score, element, gap, code):
+                column.append(0)
+            continue
+        e = sum(1 for x in row if x in c_set) / len(row)
+        combined = (e + g) / 2
+        score.append(round(combined, 3))
+        element.append(round(e, 3))
+        gap.append(g)
+        code.append(_interpret_code(combined))
+    return score, element, gap, code
+
+
+def gap_scores(rows):
+    """Rounded gap_match score of every row."""
+    return gap_columns(rows)[0]
+
+
+def coherence_scores(rows):
+    """Rounded coherence_score of every row."""
+    return coherence_columns(rows)[0]
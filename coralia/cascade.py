@@ -0,0 +1,137 @@
+"""
+Cascade tuples: strictly decreasing Fibonacci-Lucas parts with a sum.
+
+(8, 7, 5) is the only cascade triple of 20 with every part at least 5
+(axioms C8-C9). This module counts and lists such tuples for any
+target, length and floor without trying combinations.
+
+    python -m coralia.cascade 20 3 --floor 5 --list
+"""
+
+from array import array
+from itertools import accumulate
+
+from ._compat import numpy
+from .verify import fib_luc
+
+
+def parts(bound, floor=1):
+    """Fibonacci-Lucas parts in [floor, bound], largest first."""
+    return sorted((p for p in fib_luc(bound) if p >= floor), reverse=True)
+
+
+def _counter(ps):
+    """
+    Memoized count of k-tuples from ps[i:] summing to t. Parts are
+    largest first, so the k largest left bound any reachable sum.
+    """
+    prefix = list(accumulate(ps, initial=0))
+    memo = {}
+
+    def count(i, k, t):
+        if k == 0:
+            return 1 if t == 0 else 0
+        if len(ps) - i < k or t <= 0 or prefix[i + k] - prefix[i] < t:
+            return 0
+        key = (i, k, t)
+        if key not in memo:
+            memo[key] = count(i + 1, k, t) + (
+                count(i + 1, k - 1, t - ps[i]) if ps[i] <= t else 0)
+        return memo[key]
+
+    return count
+
+
+def _check(target, k):
+    if k < 0 or target < 0:
+        raise ValueError("target and k must be non-negative")
+
+
+def count_cascades(target, k, floor=1):
+    """Number of strictly decreasing k-tuples of parts >= floor summing to target."""
+    _check(target, k)
+    return _counter(parts(target, floor))(0, k, target)
+
+
+def cascades(target, k, floor=1):
+    """
+    Yield those tuples, largest part first, in lexicographically
+    decreasing order. Only branches with solutions are entered.
+    """
+    _check(target, k)
+    ps = parts(target, floor)
+    count = _counter(ps)
+
+    def walk(i, k, t, prefix):
+        if k == 0:
+            yield prefix
+            return
+        for j in range(i, len(ps) - k + 1):
+            if ps[j] <= t and count(j + 1, k - 1, t - ps[j]):
+                yield from walk(j + 1, k - 1, t - ps[j], prefix + (ps[j],))
+
+    if count(0, k, target):
+        yield from walk(0, k, target, ())
+
+
+def cascade_table(max_target, max_k=10, floors=None):
+    """
+    Counts for every target up to max_target, every k up to max_k and
+    every floor, in one pass over the parts from the largest down.
+
+    Returns {floor: table} with table[k][t] the count for target t;
+    tables are (max_k + 1) x (max_target + 1) int64 NumPy arrays, or
+    lists of array('q') rows without NumPy. `floors` defaults to every
+    part up to max_target; counts for a floor between two parts equal
+    those for the larger part.
+    """
+    _check(max_target, max_k)
+    ps = parts(max_target)
+    pending = sorted(ps if floors is None else set(floors))
+    np = numpy()
+    n = max_target + 1
+    if np is not None:
+        table = np.zeros((max_k + 1, n), dtype=np.int64)
+    else:
+        table = [array("q", bytes(8 * n)) for _ in range(max_k + 1)]
+    table[0][0] = 1
+
+    def copy():
+        return table.copy() if np is not None else [array("q", row) for row in table]
+
+    result = {}
+    for p in ps + [0]:
+        # Every part >= floor is in: the table is final for that floor
+        while pending and pending[-1] > p:
+            result[pending.pop()] = copy()
+        if not p:
+            break
+        # Highest k first, so each part is used at most once
+        for k in range(max_k, 0, -1):
+            if np is not None:
+                table[k, p:] += table[k - 1, :n - p]
+            else:
+                row, below = table[k], table[k - 1]
+                row[p:] = array("q", [a + b for a, b in zip(row[p:], below)])
+    for floor in pending:
+        result[floor] = copy()
+    return {floor: result[floor] for floor in sorted(result)}
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m coralia.cascade",
+                                     description=__doc__.splitlines()[1].strip())
+    parser.add_argument("target", type=int)
+    parser.add_argument("k", type=int)
+    parser.add_argument("--floor", type=int, default=1)
+    parser.add_argument("--list", action="store_true", help="print every tuple")
+    args = parser.parse_args(argv)
+    print(count_cascades(args.target, args.k, args.floor))
+    if args.list:
+        for t in cascades(args.target, args.k, args.floor):
+            print(" ".join(map(str, t)))
+
+
+if __name__ == "__main__":
+    main()
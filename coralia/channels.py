@@ -0,0 +1,257 @@
+"""
+Multichannel analysis of (channels, samples) recordings.
+
+    r = analyze_channels(eeg, window=256, step=32, workers=8)
+    r["zones"]        # (channels, samples) int8
+    r["gap_match"]    # (channels, windows) float64, rolling gap_match
+    r["coherence"]    # (channels, windows) float64, rolling coherence_score
+
+Window k of a channel covers samples k * step to k * step + window.
+With workers > 1 the recording is copied once into shared memory and
+each worker process analyzes a band of channels there, writing its
+rows into shared result matrices: only names and row ranges are
+pickled. Matrices are NumPy arrays, or lists of array.array rows
+without NumPy.
+
+    python -m coralia.channels --channels 256 --seconds 10 --rate 256
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from . import backends
+from ._compat import numpy
+from .results import coherence_score_batch
+from .tools import detect_zones, rolling_gap_match
+
+outputs = ("zones", "gap_match", "coherence")
+
+# Type code of each result matrix
+_types = {"zones": "b", "gap_match": "d", "coherence": "d"}
+
+# Windows scored per batch call, so sorted copies stay a few MB
+_batch_values = 1 << 20
+
+
+def _width(name, samples, window, step):
+    """Columns of a result matrix."""
+    if name == "zones":
+        return samples
+    return (samples - window) // step + 1 if samples >= window else 0
+
+
+def _rolling(row, window, step, wanted):
+    """gap_match and coherence_score of every window of one channel."""
+    np = numpy()
+    coherence = "coherence" in wanted
+    if np is None and not coherence:
+        # Without NumPy the sorted sliding window beats re-sorting each one
+        return {"gap_match": rolling_gap_match(row, window, step)}
+    n = _width("gap_match", len(row), window, step)
+    per = max(1, _batch_values // window)
+    gap, score = [], []
+    for lo in range(0, n, per):
+        hi = min(n, lo + per)
+        if np is not None:
+            batch = np.lib.stride_tricks.sliding_window_view(
+                row[lo * step:(hi - 1) * step + window], window)[::step]
+        else:
+            batch = [row[k * step:k * step + window] for k in range(lo, hi)]
+        if coherence:
+            table = coherence_score_batch(batch)
+            gap.append(table["gap_score"])
+            score.append(table["score"])
+        else:
+            gap.append(backends.active().gap_scores(batch))
+
+    def join(parts):
+        if np is not None:
+            return np.concatenate([np.zeros(0)] + parts)
+        return array("d", b"".join(p.tobytes() for p in parts))
+
+    if not coherence:
+        return {"gap_match": join(gap)}
+    return {"gap_match": join(gap), "coherence": join(score)}
+
+
+def _analyze_rows(rows, out, lo, hi, wanted, window, step, ceiling):
+    """Fill result rows lo..hi-1 of `out` from input rows."""
+    np = numpy()
+    for i in range(lo, hi):
+        row = rows[i]
+        found = {}
+        if "zones" in wanted:
+            found["zones"] = detect_zones(row, ceiling)
+        if "gap_match" in wanted or "coherence" in wanted:
+            found.update(_rolling(row, window, step, wanted))
+        for name in wanted:
+            if np is not None:
+                out[name][i] = found[name]
+            else:
+                out[name][i][:] = array(_types[name], found[name])
+
+
+def _attach(shm, typecode, shape):
+    """Rows of a (channels, width) matrix held in `shm`."""
+    np = numpy()
+    if np is not None:
+        return np.ndarray(shape, dtype=typecode, buffer=shm.buf)
+    view = shm.buf.cast(typecode)
+    width = shape[1]
+    return [view[i * width:(i + 1) * width] for i in range(shape[0])]
+
+
+def _fill(shm, rows, shape):
+    """Copy input rows into `shm`."""
+    shared = _attach(shm, "d", shape)
+    if numpy() is not None:
+        shared[:] = rows
+    else:
+        for target, row in zip(shared, rows):
+            target[:] = row
+
+
+def _read(shm, typecode, shape):
+    """A private copy of the matrix in `shm`."""
+    view = _attach(shm, typecode, shape)
+    if numpy() is not None:
+        return view.copy()
+    return [array(typecode, row) for row in view]
+
+
+def _worker(names, shape, lo, hi, wanted, window, step, ceiling):
+    """Analyze channels lo..hi-1 in shared memory, in a pool process."""
+    blocks = {key: SharedMemory(name) for key, name in names.items()}
+    channels, samples = shape
+    try:
+        # No views are kept here: they must be gone before the blocks close
+        _analyze_rows(_attach(blocks["input"], "d", shape),
+                      {name: _attach(blocks[name], _types[name],
+                                     (channels, _width(name, samples, window, step)))
+                       for name in wanted},
+                      lo, hi, wanted, window, step, ceiling)
+    finally:
+        for shm in blocks.values():
+            shm.close()
+
+
+def _matrix(data):
+    """`data` as float64 rows, checking every channel has one length."""
+    np = numpy()
+    if np is not None:
+        m = np.asarray(data, dtype=np.float64)
+        if m.ndim != 2:
+            raise ValueError("data must be (channels, samples)")
+        return m
+    rows = [r if isinstance(r, array) and r.typecode == "d" else array("d", r)
+            for r in data]
+    if len({len(r) for r in rows}) > 1:
+        raise ValueError("data must be (channels, samples)")
+    return rows
+
+
+def analyze_channels(data, window=64, step=1, ceiling=35, wanted=outputs, workers=None):
+    """
+    Zones of every sample and rolling gap_match and coherence_score of
+    every `window`-sample window, `step` apart, of each channel of a
+    (channels, samples) recording. Returns {name: matrix} for the
+    names in `wanted`, one row per channel.
+
+    workers (default: CPU count) processes share the channels; with
+    one, or one channel, everything runs here.
+    """
+    if window < 1 or step < 1:
+        raise ValueError("window and step must be positive")
+    unknown = set(wanted) - set(outputs)
+    if unknown:
+        raise ValueError(f"unknown outputs {sorted(unknown)}; choose from {outputs}")
+    wanted = [name for name in outputs if name in wanted]
+    np = numpy()
+    rows = _matrix(data)
+    channels = len(rows)
+    samples = len(rows[0]) if channels else 0
+    shape = {name: (channels, _width(name, samples, window, step)) for name in wanted}
+    workers = min(workers or os.cpu_count() or 1, channels)
+
+    if workers < 2:
+        if np is not None:
+            out = {name: np.zeros(s, dtype=_types[name]) for name, s in shape.items()}
+        else:
+            out = {name: [array(_types[name], bytes(array(_types[name]).itemsize * s[1]))
+                          for _ in range(channels)] for name, s in shape.items()}
+        _analyze_rows(rows, out, 0, channels, wanted, window, step, ceiling)
+        return out
+
+    blocks = {}
+    try:
+        blocks["input"] = SharedMemory(create=True, size=max(1, 8 * channels * samples))
+        for name, s in shape.items():
+            size = array(_types[name]).itemsize * s[0] * s[1]
+            blocks[name] = SharedMemory(create=True, size=max(1, size))
+        _fill(blocks["input"], rows, (channels, samples))
+
+        # A few bands per worker, so one slow band does not hold up the rest
+        bands = min(channels, 4 * workers)
+        edges = [channels * k // bands for k in range(bands + 1)]
+        names = {key: shm.name for key, shm in blocks.items()}
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_worker, names, (channels, samples), lo, hi,
+                                   wanted, window, step, ceiling)
+                       for lo, hi in zip(edges, edges[1:]) if hi > lo]
+            for future in futures:
+                future.result()
+
+        return {name: _read(blocks[name], _types[name], s) for name, s in shape.items()}
+    finally:
+        for shm in blocks.values():
+            shm.close()
+            shm.unlink()
+
+
+def channel_zones(data, ceiling=35, workers=None):
+    """detect_zones of every channel: a (channels, samples) int8 matrix."""
+    return analyze_channels(data, ceiling=ceiling, wanted=("zones",), workers=workers)["zones"]
+
+
+def channel_gap_match(data, window, step=1, workers=None):
+    """rolling_gap_match of every channel: a (channels, windows) matrix."""
+    return analyze_channels(data, window, step, wanted=("gap_match",),
+                            workers=workers)["gap_match"]
+
+
+def channel_coherence(data, window, step=1, workers=None):
+    """coherence_score of every window of every channel: (channels, windows)."""
+    return analyze_channels(data, window, step, wanted=("coherence",),
+                            workers=workers)["coherence"]
+
+
+def main(argv=None):
+    import argparse
+    import random
+    import time
+    parser = argparse.ArgumentParser(prog="python -m coralia.channels",
+                                     description=__doc__.splitlines()[1].strip())
+    parser.add_argument("--channels", type=int, default=256)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=256.0, help="samples per second")
+    parser.add_argument("--window", type=int, default=256)
+    parser.add_argument("--step", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    samples = int(args.seconds * args.rate)
+    rng = random.Random(args.seed)
+    data = [[rng.uniform(0, 35) for _ in range(samples)] for _ in range(args.channels)]
+    start = time.perf_counter()
+    analyze_channels(data, args.window, args.step, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{args.channels} channels x {samples} samples ({args.seconds:g} s recorded) "
+          f"analyzed in {elapsed:.2f} s by {args.workers} worker(s): "
+          f"{args.seconds / elapsed:.1f}x real time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Block chunking for compression from the gap and zone patterns.
+
+    sizes = gap_sizes(65536)                      # mean block 64 KiB
+    for frame in compress_blocks(iter_blocks(data, sizes), "zlib", workers=4):
+        ...
+
+gap_sizes repeats the 11 gaps scaled to a mean block size: three small
+blocks, runs of 2 and 3, then the 8, 7, 5 cascade of large ones.
+zone_sizes flattens each zone to its mean gap, and fixed_sizes is the
+usual scheme, for comparison. Blocks are memoryview slices of the
+input, handed to the compressor without copying; each compresses to an
+independent frame.
+
+    python -m coralia.chunk --block-size 65536 --codec zlib [FILE ...]
+"""
+
+import bz2
+import lzma
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+
+from .sequence import gaps, zones
+
+codecs = {
+    "zlib": (lambda b, level: zlib.compress(b, level), zlib.decompress, 6),
+    "lzma": (lambda b, level: lzma.compress(b, preset=level), lzma.decompress, 6),
+    "bz2": (lambda b, level: bz2.compress(b, level), bz2.decompress, 9),
+}
+
+
+def _scaled(pattern, block_size):
+    """`pattern` scaled to a mean of block_size bytes, rounded, forever."""
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    scale = block_size * len(pattern) / sum(pattern)
+    return cycle([max(1, round(g * scale)) for g in pattern])
+
+
+def gap_sizes(block_size):
+    """The gaps scaled to a mean of block_size bytes, repeating."""
+    return _scaled(gaps, block_size)
+
+
+def zone_sizes(block_size):
+    """Each zone's mean gap, once per gap, scaled like gap_sizes."""
+    return _scaled([sum(z["gaps"]) / len(z["gaps"]) for z in zones for _ in z["gaps"]],
+                   block_size)
+
+
+def fixed_sizes(block_size):
+    """block_size bytes, repeating."""
+    return _scaled([1], block_size)
+
+
+schemes = {"gap": gap_sizes, "zone": zone_sizes, "fixed": fixed_sizes}
+
+
+def iter_blocks(source, sizes):
+    """
+    Split `source` into blocks of the given sizes, the last one short.
+    A bytes-like source is sliced as memoryviews without copying; a
+    binary file is read straight into one fresh buffer per block.
+    """
+    sizes = iter(sizes)
+    if hasattr(source, "readinto"):
+        for size in sizes:
+            buf = bytearray(size)
+            n = source.readinto(buf)
+            if not n:
+                return
+            yield memoryview(buf)[:n]
+        return
+    view = memoryview(source).cast("B")
+    at = 0
+    for size in sizes:
+        if at >= len(view):
+            return
+        yield view[at:at + size]
+        at += size
+
+
+def compress_blocks(blocks, codec="zlib", level=None, workers=None):
+    """
+    Compress each block to an independent frame, yielding frames in
+    block order. With `workers` threads the codecs run in parallel
+    (they release the GIL); at most 2 * workers blocks are in flight.
+    """
+    compress, _, default = codecs[codec]
+    level = default if level is None else level
+    if not workers or workers < 2:
+        for block in blocks:
+            yield compress(block, level)
+        return
+    with ThreadPoolExecutor(workers) as pool:
+        pending = deque()
+        for block in blocks:
+            pending.append(pool.submit(compress, block, level))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def decompress_blocks(frames, codec="zlib"):
+    """Yield the blocks back from compress_blocks frames."""
+    decompress = codecs[codec][1]
+    for frame in frames:
+        yield decompress(frame)
+
+
+def corpora(size=1 << 22, seed=0):
+    """
+    Synthetic corpora of about `size` bytes: words of a small
+    vocabulary ("text"), numeric log lines ("log"), random bytes
+    ("random") and runs of each in turn ("mixed").
+    """
+    import random
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice("etaoinshrdlucmfw") for _ in range(rng.randint(2, 9)))
+             for _ in range(2000)]
+    text = " ".join(rng.choice(vocab) for _ in range(size // 5)).encode()[:size]
+    lines, n = [], 0
+    while n < size:
+        line = (f"{1700000000 + n // 64} level={rng.choice('DIWE')} "
+                f"zone={rng.randint(1, 4)} value={rng.uniform(0, 35):.3f}\n")
+        lines.append(line)
+        n += len(line)
+    log = "".join(lines).encode()[:size]
+    noise = rng.randbytes(size)
+    quarter = size // 4
+    mixed = b"".join(c[k * quarter:(k + 1) * quarter]
+                     for k, c in enumerate([text, noise, log, bytes(size)]))
+    return {"text": text, "log": log, "random": noise, "mixed": mixed}
+
+
+def measure(data, scheme="gap", block_size=1 << 16, codec="zlib", level=None,
+            workers=None, repeats=3):
+    """
+    Chunk and compress `data` with one scheme. Returns the compression
+    ratio (input over output bytes), throughput in MB/s (best of
+    `repeats`), the block count and the peak traced memory of a
+    separate run, so tracing does not slow the timed ones.
+    """
+    import time
+    import tracemalloc
+
+    def run():
+        blocks = out = 0
+        for frame in compress_blocks(iter_blocks(data, schemes[scheme](block_size)),
+                                     codec, level, workers):
+            blocks += 1
+            out += len(frame)
+        return blocks, out
+
+    best = float("inf")
+    for _ in range(repeats):
+        t = time.perf_counter()
+        blocks, out = run()
+        best = min(best, time.perf_counter() - t)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ratio": len(data) / out if out else float("inf"),
+            "mb_s": len(data) / best / 1e6 if best else float("inf"),
+            "blocks": blocks, "peak_bytes": peak}
+
+
+def benchmark(corpus, block_size=1 << 16, codec="zlib", level=None, workers=None,
+              repeats=3):
+    """measure() for every scheme on every corpus: {corpus: {scheme: {...}}}."""
+    return {name: {scheme: measure(data, scheme, block_size, codec, level, workers,
+                                   repeats)
+                   for scheme in schemes}
+            for name, data in corpus.items()}
+
+
+def main(argv=None):
+    import argparse
+    import mmap
+    import os
+    parser = argparse.ArgumentParser(prog="python -m coralia.chunk",
+                                     description=__doc__.splitlines()[1].strip())
+    parser.add_argument("files", nargs="*", help="file corpora (default: synthetic)")
+    parser.add_argument("--block-size", type=int, default=1 << 16)
+    parser.add_argument("--codec", choices=sorted(codecs), default="zlib")
+    parser.add_argument("--level", type=int)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--size", type=float, default=1 << 22, help="synthetic corpus bytes")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    maps = []
+    if args.files:
+        corpus = {}
+        for path in args.files:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    maps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                    corpus[path] = maps[-1]
+    else:
+        corpus = corpora(int(args.size), args.seed)
+    try:
+        result = benchmark(corpus, args.block_size, args.codec, args.level,
+                           args.workers, args.repeats)
+    finally:
+        for m in maps:
+            m.close()
+    print(f"{'corpus':<20}{'scheme':<8}{'ratio':>8}{'MB/s':>10}{'blocks':>8}{'peak MB':>10}")
+    for name, rows in result.items():
+        for scheme, r in rows.items():
+            print(f"{name[-20:]:<20}{scheme:<8}{r['ratio']:>8.3f}{r['mb_s']:>10.1f}"
+                  f"{r['blocks']:>8}{r['peak_bytes'] / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Command-line scorer.
+
+    python -m coralia [FILE ...] [--window N [--step S]] [--format csv]
+
+Reads numbers from files or stdin ('-'). Without --window every line is
+one record; with it the whole input is one stream cut into windows.
+Each record or window gets zone counts, gap match and coherence,
+written as JSON Lines (default) or CSV.
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from ._compat import numpy
+from .tools import coherence_score, zone_counts
+
+columns = ["source", "index", "n", "zone_1", "zone_2", "zone_3", "zone_4",
+           "gap_match", "coherence", "interpretation"]
+
+
+def _is_number(token):
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+def _numbers(text, line=1):
+    """
+    Array of the numbers in `text`, whose first line is `line`. A token
+    that is not a number raises ValueError naming its line.
+    """
+    np = numpy()
+    tokens = text.replace(",", " ").split()
+    try:
+        return np.array(tokens, dtype=float) if np is not None else array("d", map(float, tokens))
+    except ValueError:
+        for i, row in enumerate(text.split("\n")):
+            bad = [x for x in row.replace(",", " ").split() if not _is_number(x)]
+            if bad:
+                raise ValueError(f"line {line + i}: not a number: {bad[0]!r}") from None
+        raise
+
+
+def iter_blocks(stream, block_size=1 << 20):
+    """Arrays of the numbers in a text stream, one read block at a time."""
+    carry = ""
+    line = 1
+    while True:
+        text = stream.read(block_size)
+        if not text:
+            break
+        text = carry + text
+        cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"), text.rfind(","))
+        if cut < 0:
+            carry = text
+            continue
+        numbers = _numbers(text[:cut], line)
+        if len(numbers):
+            yield numbers
+        line += text.count("\n", 0, cut + 1)
+        carry = text[cut + 1:]
+    numbers = _numbers(carry, line)
+    if len(numbers):
+        yield numbers
+
+
+def iter_windows(blocks, window, step):
+    """Full windows of `window` values, `step` apart, over a block stream."""
+    buffer = array("d")
+    start = 0
+    for block in blocks:
+        buffer.extend(block.tolist() if hasattr(block, "tolist") else block)
+        while len(buffer) - start >= window:
+            yield buffer[start:start + window]
+            start += step
+        if start > len(buffer) // 2:
+            skip = min(start, len(buffer))
+            del buffer[:skip]
+            start -= skip
+
+
+def iter_records(stream):
+    """Numbers of each non-blank line."""
+    for i, line in enumerate(stream, 1):
+        tokens = line.replace(",", " ").split()
+        try:
+            values = [float(x) for x in tokens]
+        except ValueError:
+            bad = next(x for x in tokens if not _is_number(x))
+            raise ValueError(f"line {i}: not a number: {bad!r}") from None
+        if values:
+            yield values
+
+
+def score(values, ceiling=35):
+    """Zone counts, gap match and coherence of one record or window."""
+    result = coherence_score(values)
+    return {"n": len(values), "zones": zone_counts(values, ceiling),
+            "gap_match": result.get("gap_score", 0),
+            "coherence": result["score"],
+            "interpretation": result["interpretation"]}
+
+
+def _rows(name, stream, args):
+    if args.window:
+        units = iter_windows(iter_blocks(stream), args.window, args.step or args.window)
+    else:
+        units = iter_records(stream)
+    for i, values in enumerate(units):
+        yield {"source": name, "index": i, **score(values, args.ceiling)}
+
+
+def _write(rows, out, fmt):
+    writer = csv.writer(out, lineterminator="\n") if fmt == "csv" else None
+    for row in rows:
+        if writer:
+            writer.writerow([row["source"], row["index"], row["n"], *row["zones"],
+                             row["gap_match"], row["coherence"], row["interpretation"]])
+        else:
+            out.write(json.dumps(row) + "\n")
+
+
+def _score_file(path, args, out_path):
+    """Worker: score one file into a temporary output file."""
+    with open(path) as stream, open(out_path, "w") as out:
+        _write(_rows(path, stream, args), out, args.format)
+    return out_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="coralia", description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", default=["-"])
+    parser.add_argument("--window", type=int, help="values per window (default: per line)")
+    parser.add_argument("--step", type=int, help="values between windows (default: window)")
+    parser.add_argument("--ceiling", type=float, default=35)
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="processes for multiple files")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+    if args.window is not None and args.window < 1 or args.step is not None and args.step < 1:
+        parser.error("--window and --step must be positive")
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            csv.writer(out, lineterminator="\n").writerow(columns)
+        files = [f for f in args.files if f != "-"]
+        pool = None
+        if args.workers > 1 and len(files) > 1:
+            tmp = tempfile.mkdtemp(prefix="coralia-")
+            pool = ProcessPoolExecutor(min(args.workers, len(files)))
+            pending = {f: pool.submit(_score_file, f, args, os.path.join(tmp, f"{i}.out"))
+                       for i, f in enumerate(files)}
+        try:
+            for name in args.files:
+                if name == "-":
+                    _write(_rows("-", sys.stdin, args), out, args.format)
+                elif pool:
+                    with open(pending[name].result()) as part:
+                        shutil.copyfileobj(part, out)
+                else:
+                    with open(name) as stream:
+                        _write(_rows(name, stream, args), out, args.format)
+        except ValueError as e:
+            parser.exit(1, f"coralia: {name}: {e}\n")
+        finally:
+            if pool:
+                pool.shutdown()
+                shutil.rmtree(tmp, ignore_errors=True)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
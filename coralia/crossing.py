@@ -0,0 +1,124 @@
+"""Convergence-point crossing detection."""
+
+from collections import namedtuple
+
+from ._compat import numpy
+from .sequence import convergence_points
+
+Crossing = namedtuple("Crossing", "index name direction time dwell")
+Crossing.__doc__ = """\
+A signal crossing convergence point Λ`index` (1-3).
+direction is +1 upward, -1 downward; dwell is the time spent on the
+previous side (since the last crossing of this point, or the start).
+"""
+
+names = list(convergence_points)
+lambdas = [cp["value"] for cp in convergence_points.values()]
+
+
+def _bands(ceiling, band):
+    """Lower and upper switching levels per point, in signal units."""
+    if not isinstance(band, (list, tuple)):
+        band = [band] * len(lambdas)
+    scale = ceiling / 35
+    lo = [(v - b) * scale for v, b in zip(lambdas, band)]
+    hi = [(v + b) * scale for v, b in zip(lambdas, band)]
+    return lo, hi
+
+
+class CrossingDetector:
+    """
+    Per-sample crossing detection for one stream.
+
+    Values are rescaled from [0, ceiling] to [0, 35] like detect_zone.
+    Around each Λ, a signal must reach Λ + band to count as above and
+    Λ - band to count as below, so chatter inside the band is ignored.
+    `band` is in the 0-35 scale, one value or one per point. Crossings
+    are passed to `callback`; update() allocates nothing otherwise.
+    """
+
+    def __init__(self, ceiling=35, band=0.0, callback=None):
+        self.lo, self.hi = _bands(ceiling, band)
+        self.callback = callback
+        self.state = None
+        self.since = [0] * len(lambdas)
+
+    def update(self, x, t):
+        """Feed one sample at time t. Returns the number of crossings."""
+        state, lo, hi = self.state, self.lo, self.hi
+        if state is None:
+            mid = [(a + b) / 2 for a, b in zip(lo, hi)]
+            self.state = [1 if x >= m else -1 for m in mid]
+            self.since = [t] * len(lambdas)
+            return 0
+        crossed = 0
+        for i in range(len(lo)):
+            if state[i] < 0:
+                if x >= hi[i]:
+                    state[i] = 1
+                else:
+                    continue
+            elif x <= lo[i] and x < hi[i]:
+                state[i] = -1
+            else:
+                continue
+            crossed += 1
+            if self.callback is not None:
+                self.callback(Crossing(i + 1, names[i], state[i], t, t - self.since[i]))
+            self.since[i] = t
+        return crossed
+
+
+def detect_crossings(values, times=None, ceiling=35, band=0.0):
+    """
+    All crossings in an array, ordered by time then point.
+    `times` defaults to sample indices.
+    """
+    np = numpy()
+    if np is None:
+        events = []
+        detector = CrossingDetector(ceiling, band, events.append)
+        ts = range(len(values)) if times is None else times
+        for x, t in zip(values, ts):
+            detector.update(x, t)
+        return events
+
+    x = np.asarray(values)
+    if not len(x):
+        return []
+    t = np.arange(len(x)) if times is None else np.asarray(times)
+    lo, hi = _bands(ceiling, band)
+    found = []
+    for i in range(len(lambdas)):
+        s = np.where(x >= hi[i], 1, np.where(x <= lo[i], -1, 0)).astype(np.int8)
+        s[0] = 1 if x[0] >= (lo[i] + hi[i]) / 2 else -1
+        # Inside the band a sample keeps the side of the last one outside it
+        last = np.maximum.accumulate(np.where(s != 0, np.arange(len(s)), 0))
+        s = s[last]
+        at = np.flatnonzero(s[1:] != s[:-1]) + 1
+        before = t[np.concatenate(([0], at[:-1]))]
+        for k, d, when, prev in zip(at.tolist(), s[at].tolist(),
+                                    t[at].tolist(), before.tolist()):
+            found.append((k, i, Crossing(i + 1, names[i], d, when, when - prev)))
+    found.sort(key=lambda e: e[:2])
+    return [e[2] for e in found]
+
+
+async def crossings_async(source, ceiling=35, band=0.0):
+    """
+    Crossings from an async iterator of values or (time, value) pairs.
+    Bare values are timed by their sample index.
+    """
+    events = []
+    detector = CrossingDetector(ceiling, band, events.append)
+    i = 0
+    async for item in source:
+        if isinstance(item, tuple):
+            t, x = item
+        else:
+            t, x = i, item
+        i += 1
+        if detector.update(x, t):
+            for event in events:
+                yield event
+            events.clear()
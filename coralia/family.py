@@ -0,0 +1,93 @@
+"""
+Coralia-family zone specs.
+
+A spec is a tuple of zones, each zone a tuple of (gap, count) runs, as
+iter_zones takes them. C itself is
+
+    ((1, 3),), ((2, 3),), ((3, 2),), ((8, 1), (7, 1), (5, 1))
+"""
+
+
+def _counter(n_zones, vocabulary, max_runs):
+    """
+    Memoized number of ways to finish a spec from a partial one.
+
+    A partial spec is summarised by its state: open zone, runs in it,
+    last gap, span and elements still to place. Specs sharing a prefix
+    share that state, so each suffix is counted once.
+    """
+    low, high = min(vocabulary), max(vocabulary)
+    memo = {}
+
+    def count(zone, runs, last, span, left):
+        key = (zone, runs, last, span, left)
+        if key in memo:
+            return memo[key]
+        total = 0
+        if left * low <= span <= left * high:
+            if runs:
+                if zone == n_zones - 1:
+                    total += span == 0 and left == 0
+                else:
+                    total += count(zone + 1, 0, None, span, left)
+            if runs < max_runs:
+                for g in vocabulary:
+                    if g == last:
+                        continue
+                    for k in range(1, min(left, span // g) + 1):
+                        total += count(zone, runs + 1, g, span - g * k, left - k)
+        memo[key] = total
+        return total
+
+    return count
+
+
+def _check(n_zones, vocabulary, max_runs):
+    vocabulary = sorted(set(vocabulary))
+    if n_zones < 1 or max_runs < 1:
+        raise ValueError("n_zones and max_runs must be positive")
+    if not vocabulary or vocabulary[0] <= 0:
+        raise ValueError("vocabulary must hold positive gaps")
+    return vocabulary
+
+
+def count_zone_specs(ceiling=35, cardinality=12, n_zones=4,
+                     vocabulary=range(1, 9), max_runs=3):
+    """Number of specs zone_specs would yield."""
+    vocabulary = _check(n_zones, vocabulary, max_runs)
+    return _counter(n_zones, vocabulary, max_runs)(0, 0, None, ceiling, cardinality - 1)
+
+
+def zone_specs(ceiling=35, cardinality=12, n_zones=4, vocabulary=range(1, 9),
+               max_runs=3):
+    """
+    Lazily yield every spec of `n_zones` zones whose sequence runs from
+    0 to `ceiling` in `cardinality` elements.
+
+    Each zone has 1 to `max_runs` runs of gaps from `vocabulary`, and
+    neighbouring runs in a zone differ in gap, so every split of a zone
+    into runs is written one way. Branches are only entered when the
+    memoized suffix count says they lead somewhere.
+    """
+    vocabulary = _check(n_zones, vocabulary, max_runs)
+    count = _counter(n_zones, vocabulary, max_runs)
+
+    def walk(zone, runs, last, span, left, done, current):
+        if runs:
+            closed = done + (current,)
+            if zone == n_zones - 1:
+                if span == 0 and left == 0:
+                    yield closed
+            elif count(zone + 1, 0, None, span, left):
+                yield from walk(zone + 1, 0, None, span, left, closed, ())
+        if runs < max_runs:
+            for g in vocabulary:
+                if g == last:
+                    continue
+                for k in range(1, min(left, span // g) + 1):
+                    state = (zone, runs + 1, g, span - g * k, left - k)
+                    if count(*state):
+                        yield from walk(*state, done, current + ((g, k),))
+
+    if count(0, 0, None, ceiling, cardinality - 1):
+        yield from walk(0, 0, None, ceiling, cardinality - 1, (), ())
@@ -0,0 +1,284 @@
+"""Similarity index over gap patterns."""
+
+import json
+import mmap
+import random
+import struct
+from array import array
+from heapq import heappush, heappushpop
+
+from ._compat import numpy, scalars
+from .sequence import C, gaps
+
+_width = len(gaps)
+_magic = b"CGIX0001"
+
+
+def gap_vector(sequence):
+    """
+    Normalized leading gaps, as gap_match computes them.
+    Raises ValueError if gap_match would report an error.
+    """
+    s = sorted(scalars(sequence))
+    if len(s) < 2:
+        raise ValueError("Sequence too short")
+    g = [s[i+1] - s[i] for i in range(len(s) - 1)]
+    top = max(g)
+    if top == 0:
+        raise ValueError("No variation")
+    return [x / top for x in g[:_width]]
+
+
+class GapIndex:
+    """
+    Top-k search over many sequences by gap_match-style score.
+
+    Each sequence is stored once as its normalized gap vector, in flat
+    arrays. The score of two vectors is 1 - L1 / m over their first m
+    gaps, m the shorter length, so querying with C ranks the corpus
+    exactly as gap_match would. Sequences are bucketed by gap count and
+    each bucket gets a vantage-point tree, laid out implicitly over a
+    permutation array, so a query only visits branches that can still
+    reach the current top k.
+
+    New sequences wait in a small buffer that queries scan directly;
+    the trees are rebuilt once it outgrows an eighth of the index.
+    """
+
+    def __init__(self):
+        self._vectors = array("d")
+        self._lengths = array("b")
+        self._ids = array("q")
+        self._trees = {}
+        self._indexed = 0
+        self._mmap = None
+        self._taken = None
+        self._next = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, sequence, id=None):
+        """
+        Index one sequence. Returns its id: by default the next number
+        from 0 not yet in use, which is insertion order unless ids were
+        given. Raises ValueError for an id already in use.
+        """
+        id = self._store(sequence, id)
+        if len(self) - self._indexed > max(256, self._indexed // 8):
+            self.rebuild()
+        return id
+
+    def extend(self, sequences, ids=None):
+        """Index many sequences, with add()'s default ids or `ids`, then rebuild once."""
+        sequences = list(sequences)
+        ids = [None] * len(sequences) if ids is None else list(ids)
+        if len(ids) != len(sequences):
+            raise ValueError(f"{len(ids)} ids for {len(sequences)} sequences")
+        ids = [self._store(s, id) for s, id in zip(sequences, ids)]
+        self.rebuild()
+        return ids
+
+    def _store(self, sequence, id):
+        """Append one sequence under `id` (or the next free one). Returns the id."""
+        v = gap_vector(sequence)
+        if self._taken is None:
+            self._taken = set(self._ids)
+        if id is None:
+            while self._next in self._taken:
+                self._next += 1
+            id = self._next
+        elif id in self._taken:
+            raise ValueError(f"id {id} is already in the index")
+        if self._mmap is not None:
+            self._detach()
+        self._taken.add(id)
+        self._vectors.extend(v + [0.0] * (_width - len(v)))
+        self._lengths.append(len(v))
+        self._ids.append(id)
+        return id
+
+    def rebuild(self):
+        """Rebuild every tree over all stored sequences."""
+        buckets = {}
+        for pos, n in enumerate(self._lengths):
+            buckets.setdefault(n, []).append(pos)
+        self._trees = {(n, n): self._build(items, n) for n, items in buckets.items()}
+        self._indexed = len(self)
+
+    def top_k(self, sequence=C, k=10):
+        """
+        The k most similar sequences to `sequence` (default C).
+        Returns [{"id", "score"}], best first; ties go to the lower id.
+        """
+        q = gap_vector(sequence)
+        heap = []
+        vectors = self._vectors
+
+        def consider(pos, d, m):
+            score = max(0, 1 - d / m)
+            entry = (score, -self._ids[pos])
+            if len(heap) < k:
+                heappush(heap, entry)
+            elif entry > heap[0]:
+                heappushpop(heap, entry)
+
+        def radius(m):
+            if len(heap) < k:
+                return float("inf")
+            return m * (1 - heap[0][0]) + 1e-9
+
+        for n in sorted({key[0] for key in self._trees}):
+            m = min(n, len(q))
+            if (n, m) not in self._trees:
+                items = [pos for pos in range(self._indexed) if self._lengths[pos] == n]
+                self._trees[(n, m)] = self._build(items, m)
+            order, near, far = self._trees[(n, m)]
+            stack = [(0, len(order), 0.0)]
+            while stack:
+                lo, hi, bound = stack.pop()
+                if lo >= hi or bound > radius(m):
+                    continue
+                pos = order[lo]
+                base = pos * _width
+                d = sum(abs(vectors[base + j] - q[j]) for j in range(m))
+                consider(pos, d, m)
+                mid = lo + 1 + (hi - lo - 1) // 2
+                tau = radius(m)
+                # Triangle inequality: the nearer half is at least
+                # d - near[lo] away, the farther half far[lo] - d
+                sides = [(d - near[lo], lo + 1, mid), (far[lo] - d, mid, hi)]
+                sides.sort(reverse=True)
+                for lower, a, b in sides:
+                    if lower <= tau:
+                        stack.append((a, b, lower))
+
+        for pos in range(self._indexed, len(self)):
+            m = min(self._lengths[pos], len(q))
+            base = pos * _width
+            consider(pos, sum(abs(vectors[base + j] - q[j]) for j in range(m)), m)
+
+        return [{"id": -neg, "score": round(score, 3)}
+                for score, neg in sorted(heap, reverse=True)]
+
+    def _build(self, items, m):
+        """
+        VP-tree over `items` using the first m gaps. Node at position lo
+        of `order` is a vantage point; order[lo+1:mid] holds the nearer
+        half (distance <= near[lo]) and order[mid:hi] the farther half
+        (distance >= far[lo]).
+        """
+        n = len(items)
+        order = array("q", items)
+        near = array("d", bytes(8 * n))
+        far = array("d", bytes(8 * n))
+        rng = random.Random(0)
+        np = numpy()
+        if np is not None and n:
+            table = np.frombuffer(self._vectors, dtype=np.float64).reshape(-1, _width)
+            idx = np.array(order, dtype=np.int64)
+
+        stack = [(0, n)]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo < 2:
+                continue
+            pick = lo + rng.randrange(hi - lo)
+            if np is not None:
+                idx[lo], idx[pick] = idx[pick], idx[lo]
+                rest = idx[lo + 1:hi]
+                v = table[idx[lo]]
+                d = np.zeros(len(rest))
+                for j in range(m):
+                    d += np.abs(table[rest, j] - v[j])
+                by = np.argsort(d, kind="stable")
+                idx[lo + 1:hi] = rest[by]
+                d = d[by].tolist()
+            else:
+                order[lo], order[pick] = order[pick], order[lo]
+                v = order[lo] * _width
+                vec = self._vectors
+                rest = [(sum(abs(vec[p * _width + j] - vec[v + j]) for j in range(m)), p)
+                        for p in order[lo + 1:hi]]
+                rest.sort(key=lambda e: e[0])
+                order[lo + 1:hi] = array("q", [p for _, p in rest])
+                d = [x for x, _ in rest]
+            mid = lo + 1 + (hi - lo - 1) // 2
+            near[lo] = d[mid - lo - 2] if mid > lo + 1 else -1.0
+            far[lo] = d[mid - lo - 1]
+            stack.append((lo + 1, mid))
+            stack.append((mid, hi))
+
+        if np is not None and n:
+            order = array("q", idx.tobytes())
+        return order, near, far
+
+    def save(self, path):
+        """Write the index to one file that load() can memory-map."""
+        if self._indexed != len(self):
+            self.rebuild()
+        sections = {"vectors": self._vectors, "lengths": self._lengths,
+                    "ids": self._ids}
+        for (n, m), (order, near, far) in self._trees.items():
+            if n == m:
+                sections[f"order/{n}"] = order
+                sections[f"near/{n}"] = near
+                sections[f"far/{n}"] = far
+
+        layout, offset = {}, 0
+        for name, data in sections.items():
+            nbytes = len(data) * data.itemsize
+            layout[name] = [offset, _typecode(data), len(data)]
+            offset += -(-nbytes // 8) * 8
+        header = json.dumps({"sections": layout}).encode()
+        header += b" " * (-len(header) % 8)
+        with open(path, "wb") as f:
+            f.write(_magic + struct.pack("<Q", len(header)) + header)
+            for data in sections.values():
+                raw = memoryview(data).cast("B")
+                f.write(raw)
+                f.write(b"\0" * (-len(raw) % 8))
+
+    @classmethod
+    def load(cls, path):
+        """Open a saved index without copying its arrays."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        if bytes(view[:8]) != _magic:
+            raise ValueError(f"{path} is not a GapIndex file")
+        (size,) = struct.unpack("<Q", view[8:16])
+        layout = json.loads(bytes(view[16:16 + size]))["sections"]
+        start = 16 + size
+
+        def section(name):
+            offset, typecode, count = layout[name]
+            itemsize = array(typecode).itemsize
+            at = start + offset
+            return view[at:at + count * itemsize].cast(typecode)
+
+        index = cls()
+        index._mmap = mapped
+        index._vectors = section("vectors")
+        index._lengths = section("lengths")
+        index._ids = section("ids")
+        for name in layout:
+            if name.startswith("order/"):
+                n = int(name.split("/")[1])
+                index._trees[(n, n)] = (section(name), section(f"near/{n}"),
+                                        section(f"far/{n}"))
+        index._indexed = len(index._ids)
+        return index
+
+    def _detach(self):
+        """Copy memory-mapped arrays into memory so they can grow."""
+        self._vectors = array("d", self._vectors)
+        self._lengths = array("b", self._lengths)
+        self._ids = array("q", self._ids)
+        self._trees = {key: tuple(array(_typecode(a), a) for a in tree)
+                       for key, tree in self._trees.items()}
+        self._mmap = None
+
+
+def _typecode(data):
+    return data.format if isinstance(data, memoryview) else data.typecode
@@ -0,0 +1,110 @@
+"""Chunked, memory-bounded file ingestion."""
+
+import mmap
+import os
+from array import array
+
+from ._compat import numpy
+from .tools import coherence_score, zone_counts
+
+
+def read_text_chunks(path, chunk_size=65536, column=0, delimiter=None,
+                     skip=0):
+    """
+    Yield numbers from a text/CSV file, `chunk_size` at a time.
+    Reads column `column` of each line. Skips `skip` header lines,
+    blank lines and '#' comments.
+    """
+    np = numpy()
+    chunk = array("d")
+    with open(path) as f:
+        for _ in range(skip):
+            f.readline()
+        for line in f:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            chunk.append(float(line.split(delimiter)[column]))
+            if len(chunk) == chunk_size:
+                yield chunk if np is None else np.frombuffer(chunk, dtype=np.float64)
+                chunk = array("d")
+    if chunk:
+        yield chunk if np is None else np.frombuffer(chunk, dtype=np.float64)
+
+
+def read_binary_chunks(path, typecode="d", chunk_size=1 << 20, offset=0):
+    """
+    Yield a raw binary array file in `chunk_size`-element slices.
+    The file is memory-mapped and slices are views, not copies.
+    `typecode` is an array/struct code such as 'd', 'f', 'i' or 'h'.
+    """
+    itemsize = array(typecode).itemsize
+    size = (os.path.getsize(path) - offset) // itemsize
+    if size <= 0:
+        return
+
+    np = numpy()
+    if np is not None:
+        data = np.memmap(path, dtype=np.dtype(typecode), mode="r",
+                         offset=offset, shape=(size,))
+    else:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)[offset:offset + size * itemsize]
+        data = view.cast(typecode)
+    for start in range(0, size, chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def epochs(chunks, epoch_size):
+    """Regroup a stream of chunks into consecutive `epoch_size` epochs."""
+    np = numpy()
+    pending = []
+    filled = 0
+    for chunk in chunks:
+        start = 0
+        while start < len(chunk):
+            take = min(epoch_size - filled, len(chunk) - start)
+            pending.append(chunk[start:start + take])
+            filled += take
+            start += take
+            if filled == epoch_size:
+                yield _join(np, pending)
+                pending, filled = [], 0
+    if filled:
+        yield _join(np, pending)
+
+
+def _join(np, parts):
+    if len(parts) == 1:
+        return parts[0]
+    if np is not None:
+        return np.concatenate(parts)
+    joined = array(parts[0].format if isinstance(parts[0], memoryview) else parts[0].typecode)
+    for part in parts:
+        joined.extend(part)
+    return joined
+
+
+def zone_distributions(epoch_stream, ceiling=35, coherence=True):
+    """
+    Per-epoch zone counts and, optionally, coherence_score.
+    Yields {"epoch", "n", "zones": [z1, z2, z3, z4], "coherence"}.
+    """
+    for i, epoch in enumerate(epoch_stream):
+        result = {"epoch": i, "n": len(epoch), "zones": zone_counts(epoch, ceiling)}
+        if coherence:
+            result["coherence"] = coherence_score(epoch)
+        yield result
+
+
+def ingest(path, epoch_size, typecode=None, ceiling=35, coherence=True,
+           chunk_size=65536, **text_options):
+    """
+    Zone distributions of every epoch of a file, in constant memory.
+    Binary arrays need `typecode`; otherwise the file is read as text.
+    """
+    if typecode is None:
+        chunks = read_text_chunks(path, chunk_size, **text_options)
+    else:
+        chunks = read_binary_chunks(path, typecode, chunk_size)
+    return zone_distributions(epochs(chunks, epoch_size), ceiling, coherence)
@@ -0,0 +1,133 @@
+"""
+Opt-in instrumentation.
+
+    from coralia import instrument
+    instrument.enable()
+    ...
+    instrument.snapshot()
+
+Disabled (the default), an instrumented function costs one flag check.
+"""
+
+import json
+from functools import wraps
+from time import perf_counter
+
+enabled = False
+
+_registry = {}
+_sinks = []
+
+
+class _Stats:
+    __slots__ = ("calls", "total", "sizes", "phases")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.sizes = [0] * 65  # bucket b holds sizes in [2**(b-1), 2**b)
+        self.phases = {}
+
+
+def enable(*sinks):
+    """Start recording, optionally sending every call to `sinks`."""
+    global enabled
+    _sinks.extend(sinks)
+    enabled = True
+
+
+def disable():
+    """Stop recording and detach all sinks. Recorded data is kept."""
+    global enabled
+    enabled = False
+    _sinks.clear()
+
+
+def reset():
+    """Forget everything recorded so far."""
+    _registry.clear()
+
+
+def _stats(name):
+    stats = _registry.get(name)
+    if stats is None:
+        stats = _registry[name] = _Stats()
+    return stats
+
+
+def record(name, elapsed, size):
+    """Record one call of `name` taking `elapsed` seconds on `size` items."""
+    stats = _stats(name)
+    stats.calls += 1
+    stats.total += elapsed
+    stats.sizes[min(size.bit_length(), 64)] += 1
+    for sink in _sinks:
+        sink(name, elapsed, size)
+
+
+class Timer:
+    """Splits one call into phases: each lap() records time since the last."""
+
+    __slots__ = ("name", "t")
+
+    def __init__(self, name):
+        self.name = name
+        self.t = perf_counter()
+
+    def lap(self, phase):
+        now = perf_counter()
+        phases = _stats(self.name).phases
+        entry = phases.get(phase)
+        if entry is None:
+            entry = phases[phase] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += now - self.t
+        self.t = now
+
+
+def instrumented(fn, name=None):
+    """Count calls, time and input size of `fn` (as `name`) while enabled."""
+    name = name or fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return fn(*args, **kwargs)
+        data = args[0] if args else None
+        t = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - t
+            record(name, elapsed, len(data) if hasattr(data, "__len__") else 1)
+
+    return wrapper
+
+
+def snapshot():
+    """
+    Per-function calls, total and mean time, input-size histogram
+    (keyed by bucket upper bound) and per-phase calls and time.
+    """
+    result = {}
+    for name, s in _registry.items():
+        result[name] = {
+            "calls": s.calls,
+            "total_time": s.total,
+            "mean_time": s.total / s.calls if s.calls else 0.0,
+            "sizes": {2 ** b: n for b, n in enumerate(s.sizes) if n},
+            "phases": {p: {"calls": c, "total_time": t}
+                       for p, (c, t) in s.phases.items()},
+        }
+    return result
+
+
+class JsonLinesSink:
+    """Sink writing one JSON object per call to a text stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __call__(self, name, elapsed, size):
+        record = {"name": name, "elapsed": elapsed, "size": size}
+        self.stream.write(json.dumps(record) + "\n")
@@ -0,0 +1,143 @@
+"""Null-model testing."""
+
+import math
+import random
+from array import array
+from itertools import accumulate
+
+from . import backends
+from ._compat import numpy
+from .tools import gap_match, coherence_score
+
+models = ("uniform", "gap_shuffle")
+statistics = ("coherence", "gap")
+
+
+def _observed(data, statistic):
+    if statistic == "gap":
+        return gap_match(data)["score"]
+    return coherence_score(data)["score"]
+
+
+def _batch(data, model, statistic, seed, index, size):
+    """Scores of one batch of null samples, seeded by (seed, index) alone."""
+    s = sorted(data)
+    lo, hi = s[0], s[-1]
+    integral = all(float(x).is_integer() for x in s)
+    g = [s[i+1] - s[i] for i in range(len(s) - 1)]
+
+    np = numpy()
+    if np is not None:
+        rng = np.random.default_rng([seed, index])
+        if model == "gap_shuffle":
+            steps = rng.permuted(np.tile(np.array(g), (size, 1)), axis=1)
+            m = np.concatenate([np.zeros((size, 1), steps.dtype),
+                                np.cumsum(steps, axis=1)], axis=1) + lo
+        elif integral:
+            m = rng.integers(int(lo), int(hi) + 1, size=(size, len(s)))
+        else:
+            m = rng.uniform(lo, hi, size=(size, len(s)))
+        kernels = backends.get("numpy")
+        if statistic == "gap":
+            return kernels.gap_scores(m).tolist()
+        return kernels.coherence_scores(m).tolist()
+
+    rng = random.Random(f"{seed}:{index}")
+    scores = []
+    for _ in range(size):
+        if model == "gap_shuffle":
+            rng.shuffle(g)
+            sample = list(accumulate(g, initial=lo))
+        elif integral:
+            sample = [rng.randint(int(lo), int(hi)) for _ in s]
+        else:
+            sample = [rng.uniform(lo, hi) for _ in s]
+        scores.append(_observed(sample, statistic))
+    return scores
+
+
+def _wilson(k, n, z):
+    """Wilson score interval for k successes in n trials."""
+    p = k / n
+    centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def null_test(data, n_permutations=10000, model="uniform",
+              statistic="coherence", seed=None, workers=1, batch_size=1000,
+              tol=None, confidence=0.95):
+    """
+    Compare data's score against scores of null-model samples.
+
+    Models:
+        uniform      same size, uniform over [min, max] (integers if data is)
+        gap_shuffle  the observed gaps in random order, from the same minimum
+
+    Shuffling the values themselves is not a null here: both scores
+    ignore order.
+
+    Samples are drawn in batches, each seeded from (seed, batch index),
+    so the result does not depend on `workers`. With `tol`, sampling
+    stops once the p-value interval is narrower than ±tol.
+    """
+    if model not in models:
+        raise ValueError(f"model must be one of {models}")
+    if statistic not in statistics:
+        raise ValueError(f"statistic must be one of {statistics}")
+    if n_permutations < 1 or batch_size < 1:
+        raise ValueError("n_permutations and batch_size must be positive")
+    if len(data) < 2:
+        raise ValueError("Sequence too short")
+    if hasattr(data, "tolist"):
+        data = data.tolist()
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+
+    # Imported here to keep `import coralia` light
+    from concurrent.futures import ProcessPoolExecutor
+    from statistics import NormalDist
+
+    observed = _observed(data, statistic)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    null = array("d")
+    below = ties = 0
+    n_batches = -(-n_permutations // batch_size)
+    pool = None
+    if workers > 1:
+        # Workers use this process's backend, even one picked with backends.use()
+        pool = ProcessPoolExecutor(workers, initializer=backends.use,
+                                   initargs=(backends.active().name,))
+    try:
+        index = 0
+        while index < n_batches:
+            rounds = range(index, min(index + max(workers, 1), n_batches))
+            sizes = [min(batch_size, n_permutations - i * batch_size) for i in rounds]
+            args = ([data] * len(sizes), [model] * len(sizes),
+                    [statistic] * len(sizes), [seed] * len(sizes), rounds, sizes)
+            results = pool.map(_batch, *args) if pool else map(_batch, *args)
+            for scores in results:
+                null.extend(scores)
+                below += sum(1 for x in scores if x < observed)
+                ties += sum(1 for x in scores if x == observed)
+            index = rounds.stop
+
+            if tol is not None:
+                low, high = _wilson(len(null) - below, len(null), z)
+                if (high - low) / 2 < tol:
+                    break
+    finally:
+        if pool:
+            pool.shutdown()
+
+    n = len(null)
+    at_least = n - below
+    np = numpy()
+    return {
+        "observed": observed,
+        "percentile": round(100 * (below + ties / 2) / n, 3),
+        "p_value": (1 + at_least) / (1 + n),
+        "ci": _wilson(at_least, n, z),
+        "n_permutations": n,
+        "null": null if np is None else np.frombuffer(null, dtype=np.float64)
+    }
@@ -0,0 +1,162 @@
+"""
+Pitch-class scanning under transposition.
+
+A window of notes is reduced to its pitch-class set, a 12-bit mask
+(bit p set if some note is p mod 12). A lookup table indexed by mask
+holds, for each of the 4096 masks, the set of transpositions r (as a
+12-bit mask of its own) under which the window matches C mod 12
+shifted up r semitones. Scanning is then one table lookup per window.
+
+    scan(notes)   # {"positions": [...], "rotations": [...], "windows": n}
+"""
+
+from array import array
+from functools import lru_cache
+
+from ._compat import numpy
+from .sequence import C
+
+modes = ("equal", "contains", "within")
+
+
+def pc_mask(notes):
+    """12-bit pitch-class mask of some notes."""
+    mask = 0
+    for n in notes:
+        mask |= 1 << int(n) % 12
+    return mask
+
+
+def transpose(mask, r):
+    """Mask shifted up r semitones: a 12-bit rotation."""
+    r %= 12
+    return (mask << r | mask >> (12 - r)) & 0xFFF
+
+
+@lru_cache(maxsize=None)
+def rotation_table(target=pc_mask(C), mode="equal"):
+    """
+    For every 12-bit mask, the 12-bit set of rotations r under which
+    it matches the `target` mask transposed by r: equal to it,
+    containing it, or within it (and not empty).
+    """
+    if mode not in modes:
+        raise ValueError(f"mode must be one of {modes}")
+    table = array("H", bytes(2 * 4096))
+    for r, t in enumerate(transpose(target, r) for r in range(12)):
+        bit = 1 << r
+        if mode == "equal":
+            table[t] |= bit
+            continue
+        for m in range(1, 4096):
+            if (mode == "contains" and m & t == t) or (mode == "within" and m & ~t == 0):
+                table[m] |= bit
+    return table
+
+
+def window_masks(notes, window):
+    """
+    Pitch-class mask of every `window`-note window of `notes`.
+    NumPy ORs shifted copies, doubling the span each time; without it
+    a per-class count is updated as the window slides.
+    """
+    np = numpy()
+    if np is not None:
+        bits = np.left_shift(1, np.asarray(notes, dtype=np.int64) % 12).astype(np.uint16)
+        n = len(bits) - window + 1
+        if n <= 0:
+            return np.zeros(0, dtype=np.uint16)
+        span = 1
+        while span * 2 <= window:
+            bits = bits[:-span] | bits[span:]
+            span *= 2
+        # OR is idempotent, so two overlapping spans cover the window
+        return bits[:n] | bits[window - span:window - span + n]
+
+    counts = [0] * 12
+    masks = array("H")
+    mask = 0
+    pcs = [int(x) % 12 for x in notes]
+    for i, p in enumerate(pcs):
+        if not counts[p]:
+            mask |= 1 << p
+        counts[p] += 1
+        if i >= window:
+            q = pcs[i - window]
+            counts[q] -= 1
+            if not counts[q]:
+                mask &= ~(1 << q)
+        if i >= window - 1:
+            masks.append(mask)
+    return masks
+
+
+def _matches(masks, table, offset):
+    """Positions and rotations of matching windows, position-major."""
+    np = numpy()
+    if np is not None:
+        hits = np.frombuffer(table, dtype=np.uint16)[masks]
+        where = np.flatnonzero(hits)
+        rows, rots = np.nonzero((hits[where, None] >> np.arange(12, dtype=np.uint16)) & 1)
+        return where[rows] + offset, rots.astype(np.int8)
+    positions, rotations = array("q"), array("b")
+    for i, m in enumerate(masks):
+        hit = table[m]
+        while hit:
+            r = (hit & -hit).bit_length() - 1
+            positions.append(i + offset)
+            rotations.append(r)
+            hit &= hit - 1
+    return positions, rotations
+
+
+def scan_chunks(chunks, window=12, pattern=C, mode="equal"):
+    """
+    scan() over a stream of note chunks, yielding one result per chunk.
+    Windows spanning chunk borders belong to the chunk they end in, and
+    positions count from the start of the stream.
+    """
+    if window < 1:
+        raise ValueError("window must be positive")
+    table = rotation_table(pc_mask(pattern), mode)
+    np = numpy()
+    carry, start = [], 0
+    for chunk in chunks:
+        notes = list(carry) + list(chunk) if np is None else \
+            np.concatenate([np.asarray(carry, dtype=np.int64),
+                            np.asarray(chunk, dtype=np.int64)])
+        masks = window_masks(notes, window)
+        positions, rotations = _matches(masks, table, start)
+        yield {"positions": positions, "rotations": rotations, "windows": len(masks)}
+        start += len(masks)
+        carry = notes[max(0, len(notes) - window + 1):]
+
+
+def scan(notes, window=12, pattern=C, mode="equal", batch_size=1 << 16):
+    """
+    Every window of `window` consecutive notes whose pitch classes match
+    `pattern` mod 12 under some transposition.
+
+    Returns {"positions", "rotations", "windows"}: one (position,
+    rotation) pair per match, ordered by position, with rotation r the
+    semitones the pattern is shifted up by. Arrays are NumPy, or
+    array.array without NumPy. Notes are processed `batch_size` windows
+    at a time.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    chunks = (notes[i:i + batch_size] for i in range(0, len(notes), batch_size))
+    parts = list(scan_chunks(chunks, window, pattern, mode))
+    np = numpy()
+    if np is not None:
+        return {"positions": np.concatenate([np.zeros(0, np.int64)] +
+                                            [p["positions"] for p in parts]),
+                "rotations": np.concatenate([np.zeros(0, np.int8)] +
+                                            [p["rotations"] for p in parts]),
+                "windows": sum(p["windows"] for p in parts)}
+    positions, rotations = array("q"), array("b")
+    for p in parts:
+        positions.extend(p["positions"])
+        rotations.extend(p["rotations"])
+    return {"positions": positions, "rotations": rotations,
+            "windows": sum(p["windows"] for p in parts)}
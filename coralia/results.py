@@ -0,0 +1,149 @@
+"""
+Columnar results for many sequences at once.
+
+    table = coherence_score_batch(windows)
+    table["score"]       # one flat float64 column
+    table[0]             # the dict coherence_score(windows[0]) returns
+    table.buffers()      # zero-copy column buffers for Arrow or Parquet
+
+A table stores each field as one flat array, so a million rows cost a
+few bytes each rather than a dict apiece. Interpretations and errors
+are int8 codes into `interpretations` and `statuses`.
+"""
+
+from . import backends, instrument as _inst
+from ._compat import numpy
+from .sequence import gaps
+from .tools import interpretations
+
+# gap_match status codes; 0 is a scored sequence
+statuses = ("ok", "Sequence too short", "No variation")
+
+
+class Results:
+    """
+    Named columns of equal length. Index by field name for a column, or
+    by row number for that row decoded into the scalar function's dict.
+    """
+
+    __slots__ = ("kind", "columns")
+
+    def __init__(self, kind, columns):
+        self.kind = kind
+        self.columns = columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.columns[key]
+        row = {name: _item(column[key]) for name, column in self.columns.items()}
+        return _views[self.kind](row)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return f"<Results {self.kind}: {len(self)} rows, {', '.join(self.columns)}>"
+
+    def buffers(self):
+        """
+        {field: memoryview} over each column's memory, without copying.
+        Columns are contiguous, native-endian and null-free, the layout
+        Arrow expects of a primitive array's data buffer.
+        """
+        return {name: memoryview(column) for name, column in self.columns.items()}
+
+    def to_records(self):
+        """One NumPy structured array holding every column (a copy)."""
+        np = numpy()
+        if np is None:
+            raise ImportError("to_records needs NumPy")
+        dtype = [(name, np.asarray(c).dtype) for name, c in self.columns.items()]
+        records = np.empty(len(self), dtype=dtype)
+        for name, column in self.columns.items():
+            records[name] = column
+        return records
+
+    def to_arrow(self):
+        """
+        A pyarrow RecordBatch sharing the column buffers. Codes become
+        dictionary arrays, which Parquet writes dictionary-encoded.
+        """
+        import pyarrow as pa
+
+        arrays = []
+        for name, view in self.buffers().items():
+            kind = {"d": pa.float64(), "b": pa.int8()}[view.format]
+            values = pa.Array.from_buffers(kind, len(view), [None, pa.py_buffer(view)])
+            if name in _codes:
+                values = pa.DictionaryArray.from_arrays(values, pa.array(_codes[name]))
+            arrays.append(values)
+        return pa.RecordBatch.from_arrays(arrays, names=list(self.columns))
+
+
+_codes = {"status": statuses, "interpretation": interpretations}
+
+
+def _item(x):
+    return x.item() if hasattr(x, "item") else x
+
+
+def _gap_view(row):
+    if row["status"]:
+        return {"score": 0, "error": statuses[row["status"]]}
+    # Input gaps are not kept: holding them is what the table avoids
+    return {"score": row["score"], "coralia_gaps": gaps}
+
+
+def _coherence_view(row):
+    if not row["interpretation"]:
+        return {"score": 0, "interpretation": interpretations[0]}
+    return {"score": row["score"],
+            "element_score": row["element_score"],
+            "gap_score": row["gap_score"],
+            "interpretation": interpretations[row["interpretation"]]}
+
+
+_views = {"gap_match": _gap_view, "coherence_score": _coherence_view}
+
+
+def _kernel_input(sequences):
+    """The backend and row container to score `sequences` with."""
+    np = numpy()
+    if np is None:
+        return backends.get("python"), sequences
+    if isinstance(sequences, np.ndarray) and sequences.ndim == 2:
+        return backends.get("numpy"), sequences
+    rows = list(sequences)
+    if rows and len({len(r) for r in rows}) == 1:
+        return backends.get("numpy"), np.asarray(rows)
+    return backends.get("python"), [r.tolist() if hasattr(r, "tolist") else r for r in rows]
+
+
+@_inst.instrumented
+def gap_match_batch(sequences):
+    """
+    gap_match of every sequence, as a Results table with columns
+    score (float64) and status (int8 code into `statuses`).
+    Rows of a 2-D array, or equal-length sequences, are scored together
+    with NumPy; ragged input is scored one row at a time.
+    """
+    kernels, rows = _kernel_input(sequences)
+    score, status = kernels.gap_columns(rows)
+    return Results("gap_match", {"score": score, "status": status})
+
+
+@_inst.instrumented
+def coherence_score_batch(sequences):
+    """
+    coherence_score of every sequence, as a Results table with columns
+    score, element_score, gap_score (float64) and interpretation (int8
+    code into `interpretations`).
+    """
+    kernels, rows = _kernel_input(sequences)
+    score, element, gap, code = kernels.coherence_columns(rows)
+    return Results("coherence_score", {"score": score, "element_score": element,
+                                       "gap_score": gap, "interpretation": code})
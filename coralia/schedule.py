@@ -0,0 +1,227 @@
+"""
+Checkpoint and retry schedules from the gap pattern.
+
+    for wait in coralia_waits(budget=60, jitter=0.1):    # retry backoff
+        ...
+    retry(fetch, coralia_waits(60))                      # or let retry() sleep
+    list(checkpoints(3600, coralia_waits(3600)))         # checkpoint times
+
+coralia_waits yields the 11 gaps scaled to sum to `budget`: short
+waits first, then the 8, 7, 5 cascade. linear_waits and
+exponential_waits are the usual schedules at the same budget, for
+comparison; compare() runs all three through a failure simulation.
+
+    python -m coralia.schedule --work 1000 --failure-rate 0.005
+"""
+
+import asyncio
+import random
+import time
+from itertools import accumulate
+
+from .sequence import gaps
+
+
+def _shape(waits, jitter, cap, seed):
+    """Apply +-jitter (a fraction) and a cap to each wait."""
+    if not 0 <= jitter < 1:
+        raise ValueError("jitter must be in [0, 1)")
+    rng = random.Random(seed)
+    for w in waits:
+        if jitter:
+            w *= 1 + rng.uniform(-jitter, jitter)
+        yield w if cap is None else min(w, cap)
+
+
+def coralia_waits(budget, jitter=0.0, cap=None, repeat=False, seed=None):
+    """The gaps scaled to sum to `budget`, once or (repeat) forever."""
+    scale = budget / sum(gaps)
+
+    def base():
+        while True:
+            yield from (g * scale for g in gaps)
+            if not repeat:
+                return
+
+    return _shape(base(), jitter, cap, seed)
+
+
+def linear_waits(budget, n=len(gaps), jitter=0.0, cap=None, seed=None):
+    """n equal waits summing to `budget`."""
+    return _shape((budget / n for _ in range(n)), jitter, cap, seed)
+
+
+def exponential_waits(budget, n=len(gaps), factor=2.0, jitter=0.0, cap=None, seed=None):
+    """n waits growing by `factor`, summing to `budget`."""
+    first = budget * (factor - 1) / (factor ** n - 1) if factor != 1 else budget / n
+    return _shape((first * factor ** k for k in range(n)), jitter, cap, seed)
+
+
+def checkpoints(total, waits):
+    """Positions reached by successive waits, before `total`."""
+    for position in accumulate(waits):
+        # Scaled waits summing to total can fall short of it by rounding
+        if position >= total * (1 - 1e-9):
+            return
+        yield position
+
+
+def pace(waits, sleep=time.sleep):
+    """Sleep each wait in turn, yielding it after the sleep."""
+    for w in waits:
+        sleep(w)
+        yield w
+
+
+async def pace_async(waits):
+    """pace() for asyncio: `async for wait in pace_async(...)`."""
+    for w in waits:
+        await asyncio.sleep(w)
+        yield w
+
+
+def retry(fn, waits, exceptions=(Exception,), sleep=time.sleep):
+    """
+    Call fn() until it returns, sleeping the next wait after each
+    failure. Re-raises the last error once the waits run out.
+    """
+    waits = iter(waits)
+    while True:
+        try:
+            return fn()
+        except exceptions:
+            w = next(waits, None)
+            if w is None:
+                raise
+            sleep(w)
+
+
+async def retry_async(fn, waits, exceptions=(Exception,)):
+    """retry() for a coroutine function."""
+    waits = iter(waits)
+    while True:
+        try:
+            return await fn()
+        except exceptions:
+            w = next(waits, None)
+            if w is None:
+                raise
+            await asyncio.sleep(w)
+
+
+def simulate_checkpoints(positions, work, checkpoint_cost=1.0, restart_cost=5.0,
+                         failure_rate=0.01, trials=1000, seed=0):
+    """
+    Run a job of `work` time units that checkpoints at `positions`
+    (work done), under failures arriving at `failure_rate` per unit of
+    wall time. A failure loses the work since the last checkpoint (a
+    checkpoint being written counts as lost) and costs `restart_cost`.
+
+    Returns means over trials of wall_time, lost_work, overhead (time
+    spent writing checkpoints), recovery_time (restart plus redone
+    work) and failures.
+    """
+    positions = sorted(p for p in positions if 0 < p < work) + [work]
+    rng = random.Random(seed)
+    totals = dict.fromkeys(("wall_time", "lost_work", "overhead", "recovery_time",
+                            "failures"), 0.0)
+    for _ in range(trials):
+        t = saved = 0.0
+        k = 0
+        fail = rng.expovariate(failure_rate) if failure_rate else float("inf")
+        while saved < work:
+            target = positions[k]
+            cost = checkpoint_cost if target < work else 0.0
+            span = target - saved + cost
+            if t + span <= fail:
+                t += span
+                totals["overhead"] += cost
+                saved = target
+                k += 1
+                continue
+            lost = min(fail - t, target - saved)
+            totals["lost_work"] += lost
+            totals["recovery_time"] += restart_cost + lost
+            totals["failures"] += 1
+            t = fail + restart_cost
+            fail = t + rng.expovariate(failure_rate)
+        totals["wall_time"] += t
+    return {key: value / trials for key, value in totals.items()}
+
+
+def simulate_retries(waits, outage=10.0, trials=1000, seed=0):
+    """
+    Retry a call through outages of exponentially distributed length
+    (mean `outage`), first attempt at the outage start. Returns the
+    mean recovery_time (first successful attempt minus outage end) of
+    recovered trials, mean attempts, and the share of trials that gave
+    up when the waits ran out.
+    """
+    times = [0.0] + list(accumulate(waits))
+    rng = random.Random(seed)
+    delay = attempts = recovered = 0
+    for _ in range(trials):
+        end = rng.expovariate(1 / outage)
+        for k, at in enumerate(times):
+            if at >= end:
+                delay += at - end
+                attempts += k + 1
+                recovered += 1
+                break
+        else:
+            attempts += len(times)
+    return {"recovery_time": delay / recovered if recovered else float("nan"),
+            "attempts": attempts / trials,
+            "gave_up": 1 - recovered / trials}
+
+
+def compare(work=1000.0, checkpoint_cost=1.0, restart_cost=5.0, failure_rate=0.005,
+            retry_budget=60.0, outage=10.0, jitter=0.0, trials=1000, seed=0):
+    """
+    Coralia, linear and exponential schedules side by side: each places
+    as many checkpoints over `work`, and spreads as many retries over
+    `retry_budget`. Returns {name: {"checkpoint": ..., "retry": ...}}.
+    """
+    schedules = {"coralia": coralia_waits, "linear": linear_waits,
+                 "exponential": exponential_waits}
+    result = {}
+    for name, waits in schedules.items():
+        positions = list(checkpoints(work, waits(work, jitter=jitter, seed=seed)))
+        result[name] = {
+            "checkpoint": simulate_checkpoints(positions, work, checkpoint_cost,
+                                               restart_cost, failure_rate, trials, seed),
+            "retry": simulate_retries(waits(retry_budget, jitter=jitter, seed=seed),
+                                      outage, trials, seed),
+        }
+    return result
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m coralia.schedule",
+                                     description=__doc__.splitlines()[1].strip())
+    parser.add_argument("--work", type=float, default=1000.0)
+    parser.add_argument("--checkpoint-cost", type=float, default=1.0)
+    parser.add_argument("--restart-cost", type=float, default=5.0)
+    parser.add_argument("--failure-rate", type=float, default=0.005)
+    parser.add_argument("--retry-budget", type=float, default=60.0)
+    parser.add_argument("--outage", type=float, default=10.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--trials", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = compare(args.work, args.checkpoint_cost, args.restart_cost,
+                     args.failure_rate, args.retry_budget, args.outage,
+                     args.jitter, args.trials, args.seed)
+    print(f"{'schedule':<12}{'wall':>10}{'lost':>10}{'overhead':>10}{'recovery':>10}"
+          f"{'retry_rec':>11}{'attempts':>10}{'gave_up':>9}")
+    for name, r in result.items():
+        c, t = r["checkpoint"], r["retry"]
+        print(f"{name:<12}{c['wall_time']:>10.1f}{c['lost_work']:>10.1f}"
+              f"{c['overhead']:>10.1f}{c['recovery_time']:>10.1f}"
+              f"{t['recovery_time']:>11.2f}{t['attempts']:>10.2f}{t['gave_up']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
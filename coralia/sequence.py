@@ -34,11 +34,54 @@ convergence_points = {
 
 def generate():
     """Generate the Coralia Sequence from zone definitions."""
-    result = [0]
-    for zone in zones:
-        current = zone["start"]
-        for gap in zone["gaps"]:
-            current += gap
-            if current not in result:
-                result.append(current)
-    return sorted(result)
+    return sorted(iter_zones(zones))
+
+
+def iter_zones(specs, origin=0):
+    """
+    Lazily yield the sequence built from zone specs, starting at `origin`.
+
+    A spec is a dict like those in `zones`, with "gaps" or with "runs"
+    of (gap, count) pairs, an optional "repeat" count and an optional
+    "start"; a bare sequence of (gap, count) runs is a spec too. A zone
+    without "start" continues from the previous one's last value.
+    Values are yielded once each: with positive gaps and no zone
+    starting below an earlier value the sequence only rises, and no
+    values are kept; otherwise the values seen so far are.
+    """
+    specs = [_zone(spec) for spec in specs]
+    monotone = True
+    top = current = origin
+    for start, runs, repeat in specs:
+        if start is not None:
+            monotone = monotone and start >= top
+            current = start
+        monotone = monotone and all(g > 0 for g, k in runs if k)
+        current += repeat * sum(g * k for g, k in runs)
+        top = max(top, current)
+
+    seen = None if monotone else {origin}
+    yield origin
+    current = origin
+    for start, runs, repeat in specs:
+        if start is not None:
+            current = start
+        for _ in range(repeat):
+            for g, k in runs:
+                for _ in range(k):
+                    current += g
+                    if seen is None:
+                        yield current
+                    elif current not in seen:
+                        seen.add(current)
+                        yield current
+
+
+def _zone(spec):
+    """(start, runs, repeat) of one zone spec."""
+    if not isinstance(spec, dict):
+        return None, [tuple(run) for run in spec], 1
+    runs = spec.get("runs")
+    if runs is None:
+        runs = [(g, 1) for g in spec["gaps"]]
+    return spec.get("start"), [tuple(run) for run in runs], spec.get("repeat", 1)
@@ -0,0 +1,368 @@
+"""
+Local scoring server.
+
+    python -m coralia.serve --port 8035
+    python -m coralia.serve --unix /tmp/coralia.sock
+    python -m coralia.serve load --port 8035 --requests 20000 --concurrency 64
+
+POST /coherence or /gap_match with {"values": [...]}, or /zones with
+{"values": [...], "ceiling": 35}; GET /metrics. Plain HTTP/1.1 with
+keep-alive, standard library only.
+
+Concurrent requests to one endpoint wait up to `budget` seconds, or
+until `max_batch` have arrived, and are scored in one batch call. At
+most `max_pending` requests wait per endpoint; past that the server
+answers 503 at once rather than queueing without bound.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+from .results import coherence_score_batch, gap_match_batch
+from .tools import detect_zones
+
+_reasons = {200: "OK", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 500: "Internal Server Error",
+            503: "Service Unavailable"}
+
+
+def _coherence(payloads):
+    return list(coherence_score_batch([p["values"] for p in payloads]))
+
+
+def _gap_match(payloads):
+    return list(gap_match_batch([p["values"] for p in payloads]))
+
+
+def _zones(payloads):
+    """All payloads in one detect_zones call, split back per payload."""
+    values = [x for p in payloads for x in p["values"]]
+    ceilings = {p.get("ceiling", 35) for p in payloads}
+    if len(ceilings) == 1:
+        z = detect_zones(values, ceilings.pop())
+    else:
+        z = detect_zones(values, [p.get("ceiling", 35) for p in payloads
+                                  for _ in p["values"]])
+    z = z.tolist()
+    results, at = [], 0
+    for p in payloads:
+        results.append({"zones": z[at:at + len(p["values"])]})
+        at += len(p["values"])
+    return results
+
+
+endpoints = {"/coherence": _coherence, "/gap_match": _gap_match, "/zones": _zones}
+
+
+def _percentiles(latencies):
+    s = sorted(latencies)
+    if not s:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+    return {"p50": s[len(s) // 2] * 1e3, "p99": s[int(len(s) * 0.99)] * 1e3,
+            "max": s[-1] * 1e3}
+
+
+class _Batcher:
+    """Queue of one endpoint's requests and the loop that scores them."""
+
+    def __init__(self, run, budget, max_batch, max_pending):
+        self.run = run
+        self.budget = budget
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue(max_pending)
+        self.requests = self.batches = self.rejected = self.errors = 0
+        self.latencies = deque(maxlen=10000)
+
+    def submit(self, payload):
+        """Future of one payload's result. Raises QueueFull when saturated."""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((payload, future))
+        self.requests += 1
+        return future
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.budget
+            while len(batch) < self.max_batch:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                left = deadline - loop.time()
+                if left <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), left))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            payloads = [p for p, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.run, payloads)
+            except Exception as e:
+                # Score one at a time, so only the bad payloads fail
+                results = [e] if len(batch) == 1 else \
+                    await asyncio.to_thread(self._each, payloads)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    self.errors += 1
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _each(self, payloads):
+        """Result of each payload scored alone, or the exception it raised."""
+        results = []
+        for payload in payloads:
+            try:
+                results.extend(self.run([payload]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def metrics(self):
+        return {"requests": self.requests,
+                "batches": self.batches,
+                "mean_batch": self.requests / self.batches if self.batches else 0.0,
+                "pending": self.queue.qsize(),
+                "rejected": self.rejected,
+                "errors": self.errors,
+                "latency_ms": _percentiles(self.latencies)}
+
+
+class Server:
+    """
+    Micro-batching scoring server. start() it inside a running loop,
+    or call serve() to run one until interrupted.
+    """
+
+    def __init__(self, budget=0.002, max_batch=256, max_pending=1024):
+        if budget < 0 or max_batch < 1 or max_pending < 1:
+            raise ValueError("budget must be >= 0, max_batch and max_pending positive")
+        self.budget = budget
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._batchers = {}
+        self._tasks = []
+        self._started = None
+
+    async def start(self, host="127.0.0.1", port=8035, path=None):
+        """Listen on host:port, or on the Unix socket `path`. Returns the asyncio server."""
+        for name, run in endpoints.items():
+            batcher = _Batcher(run, self.budget, self.max_batch, self.max_pending)
+            self._batchers[name] = batcher
+            self._tasks.append(asyncio.create_task(batcher.serve()))
+        self._started = time.monotonic()
+        if path is not None:
+            return await asyncio.start_unix_server(self._connection, path)
+        return await asyncio.start_server(self._connection, host, port)
+
+    async def close(self):
+        """Stop the batch loops. Close the asyncio server first."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def metrics(self):
+        """Uptime and per-endpoint request, batch, backlog and latency figures."""
+        uptime = 0.0 if self._started is None else time.monotonic() - self._started
+        return {"uptime": uptime,
+                "endpoints": {name: b.metrics() for name, b in self._batchers.items()}}
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, body, close = request
+                status, result = await self._respond(method, target, body)
+                _write_response(writer, status, result, close)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, target, body):
+        if target == "/metrics":
+            return (200, self.metrics()) if method == "GET" else (405, {"error": "use GET"})
+        batcher = self._batchers.get(target)
+        if batcher is None:
+            return 404, {"error": f"no endpoint {target}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body)
+            values = payload["values"]
+            if not isinstance(values, list) or not all(
+                    type(x) in (int, float) for x in values):
+                raise ValueError
+            if "ceiling" in payload and not (type(payload["ceiling"]) in (int, float)
+                                             and payload["ceiling"] > 0):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": 'body must be {"values": [numbers]}, with any '
+                                  '"ceiling" a positive number'}
+        start = time.perf_counter()
+        try:
+            future = batcher.submit(payload)
+        except asyncio.QueueFull:
+            batcher.rejected += 1
+            return 503, {"error": "server busy"}
+        try:
+            result = await future
+        except Exception as e:
+            return 500, {"error": str(e)}
+        batcher.latencies.append(time.perf_counter() - start)
+        return 200, result
+
+
+async def _read_request(reader):
+    """(method, target, body, close) of the next request, or None at EOF."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise
+        return None
+    line, *headers = head.decode("latin-1").split("\r\n")
+    method, target, version = line.split()
+    length, close = 0, version == "HTTP/1.0"
+    for header in headers:
+        name, _, value = header.partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "connection":
+            close = value == "close"
+    body = await reader.readexactly(length) if length else b""
+    return method, target, body, close
+
+
+def _write_response(writer, status, result, close=False):
+    body = json.dumps(result).encode()
+    writer.write(f"HTTP/1.1 {status} {_reasons[status]}\r\n"
+                 f"Content-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n"
+                 f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode()
+                 + body)
+
+
+async def _request(reader, writer, method, target, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: coralia\r\n"
+                 f"Content-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    line, *headers = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    length = 0
+    for header in headers:
+        name, _, value = header.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return int(line.split()[1]), json.loads(await reader.readexactly(length))
+
+
+async def _open(host, port, path):
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def fetch(target, payload=None, host="127.0.0.1", port=8035, path=None):
+    """One request on a fresh connection: POST with a payload, else GET. Returns (status, body)."""
+    reader, writer = await _open(host, port, path)
+    try:
+        return await _request(reader, writer, "GET" if payload is None else "POST",
+                              target, payload)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load(requests=10000, concurrency=64, target="/coherence", values=None,
+               host="127.0.0.1", port=8035, path=None):
+    """
+    Load-test a running server: `concurrency` keep-alive connections
+    share `requests` requests. Returns throughput, latency percentiles
+    and the count of each response status.
+    """
+    from .sequence import C
+    payload = {"values": list(C) if values is None else values}
+    latencies, statuses = [], {}
+    remaining = requests
+
+    async def client():
+        nonlocal remaining
+        reader, writer = await _open(host, port, path)
+        try:
+            while remaining > 0:
+                remaining -= 1
+                t = time.perf_counter()
+                status, _ = await _request(reader, writer, "POST", target, payload)
+                latencies.append(time.perf_counter() - t)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start
+    return {"requests": requests, "seconds": elapsed, "rps": requests / elapsed,
+            "latency_ms": _percentiles(latencies), "status": statuses}
+
+
+def serve(host="127.0.0.1", port=8035, path=None, **options):
+    """Run a Server until interrupted."""
+    async def run():
+        server = await Server(**options).start(host, port, path)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m coralia.serve",
+                                     description=__doc__.splitlines()[1].strip())
+    parser.add_argument("mode", nargs="?", choices=["serve", "load"], default="serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8035)
+    parser.add_argument("--unix", help="Unix socket path instead of TCP")
+    parser.add_argument("--budget-ms", type=float, default=2.0,
+                        help="longest wait for a batch to fill")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-pending", type=int, default=1024)
+    parser.add_argument("--requests", type=int, default=10000, help="load: total requests")
+    parser.add_argument("--concurrency", type=int, default=64, help="load: connections")
+    parser.add_argument("--endpoint", default="/coherence", help="load: target")
+    args = parser.parse_args(argv)
+
+    if args.mode == "load":
+        result = asyncio.run(load(args.requests, args.concurrency, args.endpoint,
+                                  host=args.host, port=args.port, path=args.unix))
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        where = args.unix or f"http://{args.host}:{args.port}"
+        print(f"coralia scoring server on {where}", file=sys.stderr)
+        serve(args.host, args.port, args.unix, budget=args.budget_ms / 1000,
+              max_batch=args.max_batch, max_pending=args.max_pending)
+
+
+if __name__ == "__main__":
+    main()
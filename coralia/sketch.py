@@ -0,0 +1,369 @@
+"""
+Mergeable sketches of zone and gap distributions.
+
+    s = ZoneSketch(ceiling=100)
+    s.update(chunk, gaps=True)          # on each worker
+    total = ZoneSketch.from_bytes(a).merge(ZoneSketch.from_bytes(b))
+    total.fraction_above(convergence_points["lambda_2"]["value"])
+
+Zone counts are exact. Values and gaps within each zone go into
+QuantileSketch, a log-bucketed sketch (as in DDSketch) whose quantiles
+are within `relative_accuracy` of a true value, in bounded memory.
+Merging adds bucket counts, so it is exact and order-independent.
+"""
+
+import math
+import struct
+
+from ._compat import numpy
+from .tools import detect_zone, detect_zones
+
+_tiny = 1e-12  # magnitudes at or below this count as zero
+
+
+def _varint(n, out):
+    while n > 0x7F:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, at):
+    n = shift = 0
+    while True:
+        b = data[at]
+        at += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, at
+        shift += 7
+
+
+class QuantileSketch:
+    """
+    Quantiles of a stream of numbers to a relative accuracy.
+
+    Each magnitude x lands in bucket ceil(log(x) / log(gamma)), gamma =
+    (1 + a) / (1 - a); every value in a bucket is within a of the
+    bucket's representative. Past `max_buckets` per sign, the buckets
+    nearest zero are folded together, keeping the upper tail accurate.
+    NaN is ignored.
+    """
+
+    __slots__ = ("relative_accuracy", "max_buckets", "count", "zero", "min",
+                 "max", "sum", "positive", "negative", "_multiplier", "_gamma")
+
+    _header = struct.Struct("<4sdIqqddd")
+    _magic = b"CQS1"
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self._gamma)
+        self.count = self.zero = 0
+        self.min, self.max, self.sum = math.inf, -math.inf, 0.0
+        self.positive = {}
+        self.negative = {}
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x, weight=1):
+        """Add one value `weight` times."""
+        if x != x:
+            return
+        self.count += weight
+        self.sum += x * weight
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        if x > _tiny:
+            store = self.positive
+        elif x < -_tiny:
+            store, x = self.negative, -x
+        else:
+            self.zero += weight
+            return
+        i = math.ceil(math.log(x) * self._multiplier)
+        store[i] = store.get(i, 0) + weight
+        if len(store) > self.max_buckets:
+            self._collapse(store)
+
+    def extend(self, values):
+        """Add many values."""
+        np = numpy()
+        if np is None:
+            for x in values:
+                self.add(x)
+            return
+        v = np.asarray(values, dtype=np.float64).ravel()
+        v = v[~np.isnan(v)]
+        if not len(v):
+            return
+        self.count += len(v)
+        self.sum += float(v.sum())
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        for store, side in ((self.positive, v[v > _tiny]), (self.negative, -v[v < -_tiny])):
+            if len(side):
+                idx, counts = np.unique(np.ceil(np.log(side) * self._multiplier),
+                                        return_counts=True)
+                for i, k in zip(idx.astype(np.int64).tolist(), counts.tolist()):
+                    store[i] = store.get(i, 0) + k
+                if len(store) > self.max_buckets:
+                    self._collapse(store)
+        self.zero += int((np.abs(v) <= _tiny).sum())
+
+    def _collapse(self, store):
+        keys = sorted(store)
+        cut = keys[len(keys) - self.max_buckets]
+        folded = sum(store.pop(i) for i in keys[:len(keys) - self.max_buckets])
+        store[cut] += folded
+
+    def merge(self, other):
+        """Add another sketch's contents to this one. Returns self."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("sketches must share relative_accuracy")
+        self.count += other.count
+        self.zero += other.zero
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for store, theirs in ((self.positive, other.positive),
+                              (self.negative, other.negative)):
+            for i, k in theirs.items():
+                store[i] = store.get(i, 0) + k
+            if len(store) > self.max_buckets:
+                self._collapse(store)
+        return self
+
+    def _value(self, i):
+        return 2 * self._gamma ** i / (self._gamma + 1)
+
+    def _buckets(self):
+        """(representative value, count) in increasing order of value."""
+        for i in sorted(self.negative, reverse=True):
+            yield -self._value(i), self.negative[i]
+        if self.zero:
+            yield 0.0, self.zero
+        for i in sorted(self.positive):
+            yield self._value(i), self.positive[i]
+
+    def quantile(self, q):
+        """Value at quantile q (0-1), exact at 0 and 1; NaN when empty."""
+        if not self.count:
+            return math.nan
+        if q <= 0 or q >= 1:
+            return self.min if q <= 0 else self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        for value, k in self._buckets():
+            seen += k
+            if seen > rank:
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def fraction_below(self, x):
+        """
+        Approximate share of values <= x. Buckets wholly below x count
+        in full, the one holding x in proportion to where x falls in it.
+        """
+        if not self.count:
+            return 0.0
+        if x >= self.max:
+            return 1.0
+        if x < self.min:
+            return 0.0
+        if x > _tiny:
+            i = math.ceil(math.log(x) * self._multiplier)
+            below = sum(self.negative.values()) + self.zero
+            below += sum(k for j, k in self.positive.items() if j < i)
+            part, share = self.positive.get(i, 0), self._share(i, x)
+        elif x < -_tiny:
+            i = math.ceil(math.log(-x) * self._multiplier)
+            below = sum(k for j, k in self.negative.items() if j > i)
+            part, share = self.negative.get(i, 0), 1 - self._share(i, -x)
+        else:
+            below, part, share = sum(self.negative.values()) + self.zero, 0, 0
+        return (below + part * share) / self.count
+
+    def _share(self, i, x):
+        """Position of magnitude x within bucket i, 0 at its bottom, 1 at its top."""
+        lo, hi = self._gamma ** (i - 1), self._gamma ** i
+        return min(1.0, max(0.0, (x - lo) / (hi - lo)))
+
+    def to_bytes(self):
+        """Compact encoding: a fixed header, then varint-coded buckets."""
+        out = bytearray(self._header.pack(
+            self._magic, self.relative_accuracy, self.max_buckets, self.count,
+            self.zero, self.min, self.max, self.sum))
+        for store in (self.positive, self.negative):
+            _varint(len(store), out)
+            prev = 0
+            for i in sorted(store):
+                # Delta of sorted indices, zigzag-coded: small and non-negative
+                d = i - prev
+                _varint(d * 2 if d >= 0 else -d * 2 - 1, out)
+                _varint(store[i], out)
+                prev = i
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data, at=0, _end=False):
+        """Sketch encoded by to_bytes."""
+        magic, accuracy, max_buckets, count, zero, lo, hi, total = \
+            cls._header.unpack_from(data, at)
+        if magic != cls._magic:
+            raise ValueError("not a QuantileSketch encoding")
+        sketch = cls(accuracy, max_buckets)
+        sketch.count, sketch.zero = count, zero
+        sketch.min, sketch.max, sketch.sum = lo, hi, total
+        at += cls._header.size
+        for store in (sketch.positive, sketch.negative):
+            n, at = _read_varint(data, at)
+            i = 0
+            for _ in range(n):
+                d, at = _read_varint(data, at)
+                i += d // 2 if d % 2 == 0 else -(d + 1) // 2
+                store[i], at = _read_varint(data, at)
+        return (sketch, at) if _end else sketch
+
+
+class ZoneSketch:
+    """
+    Exact zone counts, and quantile sketches of values and of gaps in
+    each zone, for values on a `ceiling` scale.
+
+    A gap belongs to the zone of its lower value. Gaps come either
+    from update(..., gaps=True), which takes the gaps of each sorted
+    chunk as gap_match does, or ready-made from update_gaps().
+    """
+
+    _magic = b"CZS1"
+
+    def __init__(self, ceiling=35, relative_accuracy=0.01, max_buckets=2048):
+        self.ceiling = ceiling
+        self.counts = [0, 0, 0, 0]
+        self.values = [QuantileSketch(relative_accuracy, max_buckets) for _ in range(4)]
+        self.gaps = [QuantileSketch(relative_accuracy, max_buckets) for _ in range(4)]
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def update(self, values, zones=None, gaps=False):
+        """
+        Add a chunk of values. `zones` is their detect_zone output if
+        already computed. With gaps, also add the chunk's sorted gaps.
+        """
+        if zones is None:
+            zones = detect_zones(values, self.ceiling)
+        np = numpy()
+        if np is not None:
+            v = np.asarray(values, dtype=np.float64)
+            z = np.asarray(zones)
+            for k in range(4):
+                mask = z == k + 1
+                self.counts[k] += int(mask.sum())
+                self.values[k].extend(v[mask])
+            if gaps and len(v) > 1:
+                order = np.argsort(v, kind="stable")
+                self.update_gaps(np.diff(v[order]), z[order][:-1])
+            return
+        values = list(values)
+        zones = list(zones)
+        for x, k in zip(values, zones):
+            self.counts[k - 1] += 1
+            self.values[k - 1].add(x)
+        if gaps and len(values) > 1:
+            pairs = sorted(zip(values, zones))
+            self.update_gaps([b[0] - a[0] for a, b in zip(pairs, pairs[1:])],
+                             [a[1] for a in pairs[:-1]])
+
+    def update_gaps(self, gaps, zones):
+        """Add gaps with the zone (1-4) of each, or one zone for all."""
+        np = numpy()
+        if isinstance(zones, int):
+            self.gaps[zones - 1].extend(gaps)
+        elif np is not None:
+            g, z = np.asarray(gaps), np.asarray(zones)
+            for k in range(4):
+                self.gaps[k].extend(g[z == k + 1])
+        else:
+            for x, k in zip(gaps, zones):
+                self.gaps[k - 1].add(x)
+
+    def merge(self, other):
+        """Add another sketch of the same ceiling. Returns self."""
+        if other.ceiling != self.ceiling:
+            raise ValueError("sketches must share a ceiling")
+        for k in range(4):
+            self.counts[k] += other.counts[k]
+            self.values[k].merge(other.values[k])
+            self.gaps[k].merge(other.gaps[k])
+        return self
+
+    def occupancy(self):
+        """Share of values in each zone, exactly."""
+        n = len(self)
+        return [c / n if n else 0.0 for c in self.counts]
+
+    def fraction_above(self, x):
+        """
+        Share of values past x on the 0-35 scale (e.g. lambda_2, the 43%
+        cliff). Exact at zone bounds, sketch-accurate within a zone.
+        """
+        n = len(self)
+        if not n:
+            return 0.0
+        raw = x * self.ceiling / 35
+        zone = detect_zone(x)
+        above = sum(self.counts[zone:])
+        inside = self.values[zone - 1]
+        if len(inside):
+            # Zone count times the sketch's share of it, so NaN counts stay exact
+            above += self.counts[zone - 1] * (1 - inside.fraction_below(raw))
+        return above / n
+
+    def quantile(self, q, zone=None):
+        """Value quantile within one zone (1-4), or over all values."""
+        return self._pick(self.values, zone).quantile(q)
+
+    def gap_quantile(self, q, zone=None):
+        """Gap quantile within one zone (1-4), or over all gaps."""
+        return self._pick(self.gaps, zone).quantile(q)
+
+    def _pick(self, sketches, zone):
+        if zone is not None:
+            return sketches[zone - 1]
+        total = QuantileSketch(sketches[0].relative_accuracy, sketches[0].max_buckets)
+        for s in sketches:
+            total.merge(s)
+        return total
+
+    def to_bytes(self):
+        """Compact encoding of the whole sketch."""
+        out = bytearray(self._magic + struct.pack("<d", self.ceiling))
+        for c in self.counts:
+            _varint(c, out)
+        for s in self.values + self.gaps:
+            out += s.to_bytes()
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Sketch encoded by to_bytes."""
+        if data[:4] != cls._magic:
+            raise ValueError("not a ZoneSketch encoding")
+        (ceiling,) = struct.unpack_from("<d", data, 4)
+        sketch = cls(ceiling)
+        at = 12
+        for k in range(4):
+            sketch.counts[k], at = _read_varint(data, at)
+        parts = []
+        for _ in range(8):
+            s, at = QuantileSketch.from_bytes(data, at, _end=True)
+            parts.append(s)
+        sketch.values, sketch.gaps = parts[:4], parts[4:]
+        return sketch
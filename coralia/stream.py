@@ -0,0 +1,82 @@
+"""Streaming analysis."""
+
+from collections import deque
+
+from ._compat import scalars
+from .sequence import C
+from .tools import _SortedWindow, _interpret
+
+_c_set = frozenset(C)
+
+
+class CoherenceStream:
+    """
+    coherence_score kept up to date as values arrive.
+
+    Over the last `window` values, snapshot() equals coherence_score on
+    that window. With `decay` (0-1), element hits and gap scores are
+    exponentially weighted by age instead, each sample counting `decay`
+    times as much as the one after it; the gap score of each step is
+    still taken over the bounded window.
+    """
+
+    def __init__(self, window=256, decay=None):
+        if window < 1:
+            raise ValueError("window must be positive")
+        if decay is not None and not 0 < decay <= 1:
+            raise ValueError("decay must be in (0, 1]")
+        self.window = window
+        self.decay = decay
+        self._values = deque()
+        self._sorted = _SortedWindow()
+        self._hits = 0
+        self._w_hits = 0.0
+        self._w_gap = 0.0
+        self._w_total = 0.0
+
+    def __len__(self):
+        return len(self._values)
+
+    def push(self, x):
+        """Add one value, evicting the oldest once the window is full."""
+        values = self._values
+        if len(values) == self.window:
+            old = values.popleft()
+            self._sorted.remove(old)
+            self._hits -= old in _c_set
+        values.append(x)
+        self._sorted.add(x)
+        hit = x in _c_set
+        self._hits += hit
+
+        if self.decay is not None:
+            d = self.decay
+            self._w_hits = self._w_hits * d + hit
+            self._w_gap = self._w_gap * d + self._sorted.score()
+            self._w_total = self._w_total * d + 1
+
+    def push_many(self, values):
+        """Add values in order."""
+        for x in scalars(values):
+            self.push(x)
+
+    def snapshot(self):
+        """Current score in the format returned by coherence_score."""
+        if not self._values:
+            return {"score": 0, "interpretation": "No data"}
+
+        if self.decay is None:
+            element_score = self._hits / len(self._values)
+            gap_score = self._sorted.score()
+        else:
+            element_score = self._w_hits / self._w_total
+            gap_score = self._w_gap / self._w_total
+
+        combined = (element_score + gap_score) / 2
+
+        return {
+            "score": round(combined, 3),
+            "element_score": round(element_score, 3),
+            "gap_score": round(gap_score, 3),
+            "interpretation": _interpret(combined)
+        }
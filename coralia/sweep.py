@@ -0,0 +1,138 @@
+"""Resumable parameter sweeps over solve_axioms."""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .verify import solve_axioms
+
+
+def make_shards(ceilings, cardinalities, shard_size=64):
+    """Split the (ceiling, cardinality) grid into fixed, ordered shards."""
+    grid = [(c, k) for c in sorted(set(ceilings)) for k in sorted(set(cardinalities))]
+    return [grid[i:i + shard_size] for i in range(0, len(grid), shard_size)]
+
+
+def run_shard(shard, params):
+    """Solution count of every (ceiling, cardinality) pair in a shard."""
+    return [[c, k, sum(1 for _ in solve_axioms(c, k, **params))] for c, k in shard]
+
+
+def _load(path, header):
+    """
+    Completed shard results from a checkpoint file, if it matches.
+    A torn last line from an interrupted write is cut off.
+    """
+    done = {}
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            f.truncate(len(complete))
+    lines = complete.decode().splitlines()
+    if lines and json.loads(lines[0]) != header:
+        raise ValueError(f"{path} is a checkpoint of a different sweep")
+    for line in lines[1:]:
+        record = json.loads(line)
+        done[record["shard"]] = record["counts"]
+    return done
+
+
+def sweep(ceilings, cardinalities, checkpoint=None, workers=1,
+          shard_size=64, progress=None, **params):
+    """
+    Count solve_axioms solutions over a (ceiling, cardinality) grid.
+
+    Each finished shard is appended to `checkpoint` (JSON Lines), and a
+    rerun with the same arguments skips shards already there. `params`
+    go to solve_axioms. `progress(done, total, shards_per_sec, eta_sec)`
+    is called after each shard.
+
+    Returns {(ceiling, cardinality): count}.
+    """
+    shards = make_shards(ceilings, cardinalities, shard_size)
+    header = {"ceilings": sorted(set(ceilings)),
+              "cardinalities": sorted(set(cardinalities)),
+              "shard_size": shard_size, "params": params}
+    header = json.loads(json.dumps(header))
+    done = _load(checkpoint, header)
+    todo = [i for i in range(len(shards)) if i not in done]
+
+    out = None
+    if checkpoint:
+        fresh = not os.path.exists(checkpoint) or not os.path.getsize(checkpoint)
+        out = open(checkpoint, "a")
+        if fresh:
+            out.write(json.dumps(header) + "\n")
+
+    def record(i, counts):
+        done[i] = counts
+        if out:
+            out.write(json.dumps({"shard": i, "counts": counts}) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+        if progress:
+            finished = len(done) - (len(shards) - len(todo))
+            rate = finished / max(time.perf_counter() - start, 1e-9)
+            eta = (len(shards) - len(done)) / rate if rate else float("inf")
+            progress(len(done), len(shards), rate, eta)
+
+    start = time.perf_counter()
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                futures = {pool.submit(run_shard, shards[i], params): i for i in todo}
+                for future in as_completed(futures):
+                    record(futures[future], future.result())
+        else:
+            for i in todo:
+                record(i, run_shard(shards[i], params))
+    finally:
+        if out:
+            out.close()
+
+    table = {}
+    for i in sorted(done):
+        for c, k, n in done[i]:
+            table[(c, k)] = n
+    return table
+
+
+def _span(text):
+    """'35' or '35:200' (inclusive) or '35:200:5' as a range."""
+    parts = [int(x) for x in text.split(":")]
+    if len(parts) == 1:
+        return range(parts[0], parts[0] + 1)
+    return range(parts[0], parts[1] + 1, *parts[2:])
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=sweep.__doc__.splitlines()[1].strip())
+    parser.add_argument("--ceilings", type=_span, required=True)
+    parser.add_argument("--cardinalities", type=_span, required=True)
+    parser.add_argument("--checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard-size", type=int, default=64)
+    parser.add_argument("--no-seed", action="store_true", help="drop the C6c seed")
+    args = parser.parse_args(argv)
+
+    def report(done, total, rate, eta):
+        print(f"\r{done}/{total} shards  {rate:.2f} shards/s  ETA {eta:.0f}s",
+              end="", file=sys.stderr, flush=True)
+
+    params = {"seed": []} if args.no_seed else {}
+    table = sweep(args.ceilings, args.cardinalities, args.checkpoint,
+                  args.workers, args.shard_size, report, **params)
+    print(file=sys.stderr)
+    print("ceiling,cardinality,solutions")
+    for (c, k), n in sorted(table.items()):
+        print(f"{c},{k},{n}")
+
+
+if __name__ == "__main__":
+    main()
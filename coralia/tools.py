@@ -1,46 +1,146 @@
 """Analysis tools."""
 
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from heapq import heappush, heappushpop
+from numbers import Number
+from time import perf_counter
+
+from . import backends, instrument as _inst
+from ._compat import numpy, scalars
 from .sequence import C, gaps, zones, convergence_points
 
+# Upper bound (inclusive) of every zone but the last: [3, 9, 15]
+zone_bounds = [z["elements"][-1] for z in zones[:-1]]
+
+norm_gaps = [x / max(gaps) for x in gaps]
+
+# coherence_score interpretations by code; code 0 is "No data"
+interpretations = ("No data", "No significant alignment", "Weak alignment",
+                   "Moderate alignment", "Strong alignment")
+
+
+def _widen(a):
+    """
+    NumPy array `a` with narrow integers as int64 and narrow floats as
+    float64, so its differences neither wrap nor lose precision.
+    """
+    if a.dtype.kind in "iub":
+        return a.astype("int64")
+    if a.dtype.kind == "f" and a.dtype.itemsize < 8:
+        return a.astype("float64")
+    return a
+
+
+def _sized(values):
+    """`values` as scalars(), materializing iterables without a length."""
+    return scalars(values) if hasattr(values, "__len__") else list(values)
+
 
 def detect_zone(value, ceiling=35):
     """
     Map a value to its zone (1-4).
     Scales to [0, 35] if ceiling differs.
     """
+    # Scalar hot path: an inline check is cheaper than a wrapper call
+    t = perf_counter() if _inst.enabled else None
     if ceiling != 35:
         value = (value / ceiling) * 35
 
     if value <= 3:
-        return 1
+        zone = 1
     elif value <= 9:
-        return 2
+        zone = 2
     elif value <= 15:
-        return 3
+        zone = 3
     else:
-        return 4
+        zone = 4
+
+    if t is not None:
+        _inst.record("detect_zone", perf_counter() - t, 1)
+    return zone
+
+
+@_inst.instrumented
+def detect_zones(values, ceiling=35):
+    """
+    Map many values to their zones (1-4) at once.
+    Same answers as detect_zone. `ceiling` is a scalar or one per value.
+    Returns an int8 NumPy array, or array('b') without NumPy. Raises
+    ValueError for a zero ceiling or a per-value ceiling of the wrong
+    length.
+    """
+    return backends.active().detect_zones(values, ceiling)
+
 
+def zone_counts(values, ceiling=35):
+    """How many values fall in each zone: [z1, z2, z3, z4]."""
+    z = detect_zones(values, ceiling)
+    np = numpy()
+    if np is not None:
+        return np.bincount(z, minlength=5)[1:].tolist()
+    return [z.count(k) for k in (1, 2, 3, 4)]
 
-def gap_match(sequence):
+
+def _detect_zones(values, ceiling=35):
+    """Pure-Python detect_zones."""
+    timer = _inst.Timer("detect_zones") if _inst.enabled else None
+    if not isinstance(ceiling, Number):
+        values, ceiling = _sized(values), _sized(ceiling)
+        if len(ceiling) != len(values):
+            raise ValueError(f"{len(ceiling)} ceilings for {len(values)} values")
+        try:
+            values = [x if c == 35 else (x / c) * 35
+                      for x, c in zip(values, ceiling)]
+        except ZeroDivisionError:
+            raise ValueError("ceiling must be non-zero") from None
+    elif ceiling == 0:
+        raise ValueError("ceiling must be non-zero")
+    elif ceiling != 35:
+        values = [(x / ceiling) * 35 for x in values]
+    if timer:
+        timer.lap("scale")
+    # NaN fails every `<=` in detect_zone and lands in zone 4
+    zones = array("b", [bisect_left(zone_bounds, x) + 1 if x == x else 4
+                        for x in values])
+    if timer:
+        timer.lap("search")
+    return zones
+
+
+@_inst.instrumented
+def gap_match(sequence, presorted=False):
     """
     Compare a sequence's gaps to Coralia gap pattern.
     Returns similarity score 0-1.
+
+    Buffers (array.array, memoryview, a typed cast of an mmap) are read
+    in place. presorted=True skips the sort for ascending input; it is
+    trusted, not checked.
     """
+    return backends.active().gap_match(sequence, presorted)
+
+
+def _gap_match(sequence, presorted=False):
+    """Pure-Python gap_match."""
     if len(sequence) < 2:
         return {"score": 0, "error": "Sequence too short"}
 
-    s = sorted(sequence)
+    timer = _inst.Timer("gap_match") if _inst.enabled else None
+    s = scalars(sequence)
+    if not presorted:
+        s = sorted(s)
+    if timer:
+        timer.lap("sort")
     g = [s[i+1] - s[i] for i in range(len(s) - 1)]
 
     if max(g) == 0:
         return {"score": 0, "error": "No variation"}
 
-    norm_input = [x / max(g) for x in g]
-    norm_coralia = [x / max(gaps) for x in gaps]
-
-    min_len = min(len(norm_input), len(norm_coralia))
-    diff = sum(abs(norm_input[i] - norm_coralia[i]) for i in range(min_len))
-    score = max(0, 1 - diff / min_len)
+    score = _gap_score(g, max(g))
+    if timer:
+        timer.lap("normalize")
 
     return {
         "score": round(score, 3),
@@ -49,35 +149,253 @@ def gap_match(sequence):
     }
 
 
-def coherence_score(data):
+# gap_match called from inside another tool, recorded as a call of its own
+_nested_gap_match = _inst.instrumented(_gap_match, "gap_match")
+
+
+def _gap_score(g, top):
+    """Unrounded gap_match score of leading gaps `g` scaled by `top`."""
+    min_len = min(len(g), len(norm_gaps))
+    diff = sum(abs(g[i] / top - norm_gaps[i]) for i in range(min_len))
+    return max(0, 1 - diff / min_len)
+
+
+class _SortedWindow:
+    """
+    Sorted multiset of window values and of their gaps.
+    Adding or removing a value costs one bisect per list.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.gaps = []
+
+    def add(self, x):
+        v, g = self.values, self.gaps
+        i = bisect_right(v, x)
+        if 0 < i < len(v):
+            del g[bisect_left(g, v[i] - v[i-1])]
+        if i > 0:
+            insort(g, x - v[i-1])
+        if i < len(v):
+            insort(g, v[i] - x)
+        v.insert(i, x)
+
+    def remove(self, x):
+        v, g = self.values, self.gaps
+        i = bisect_left(v, x)
+        if i > 0:
+            del g[bisect_left(g, x - v[i-1])]
+        if i < len(v) - 1:
+            del g[bisect_left(g, v[i+1] - x)]
+            if i > 0:
+                insort(g, v[i+1] - v[i-1])
+        del v[i]
+
+    def score(self):
+        """Rounded gap_match score of the current window."""
+        s = self.values
+        if len(s) < 2 or self.gaps[-1] == 0:
+            return 0
+        g = [s[i+1] - s[i] for i in range(min(len(s) - 1, len(norm_gaps)))]
+        return round(_gap_score(g, self.gaps[-1]), 3)
+
+
+@_inst.instrumented
+def rolling_gap_match(series, window, step=1, presorted=False):
+    """
+    gap_match score of every `window`-long slice of `series`, `step` apart.
+    Keeps the window sorted between steps instead of re-sorting each slice.
+    With presorted=True (ascending series) every slice is already
+    sorted, so only the largest gap per slice is tracked.
+    Returns a float64 NumPy array, or array('d') without NumPy.
+    """
+    if window < 1 or step < 1:
+        raise ValueError("window and step must be positive")
+    series = scalars(series)
+    np = numpy()
+    if presorted:
+        scores = _rolling_presorted(series, window, step)
+        return scores if np is None else np.frombuffer(scores, dtype=np.float64)
+
+    scores = array("d")
+    w = _SortedWindow()
+    prev = None
+    for start in range(0, len(series) - window + 1, step):
+        if prev is None or start - prev >= window:
+            w = _SortedWindow()
+            for x in series[start:start + window]:
+                w.add(x)
+        else:
+            for x in series[prev:start]:
+                w.remove(x)
+            for x in series[prev + window:start + window]:
+                w.add(x)
+        scores.append(w.score())
+        prev = start
+
+    return scores if np is None else np.frombuffer(scores, dtype=np.float64)
+
+
+def _rolling_presorted(s, window, step):
+    """rolling_gap_match scores of an ascending series."""
+    starts = range(0, len(s) - window + 1, step)
+    if window < 2:
+        return array("d", bytes(8 * len(starts)))
+    g = [s[i+1] - s[i] for i in range(len(s) - 1)]
+    m = min(window - 1, len(norm_gaps))
+    scores = array("d")
+    window_max = deque()
+    pushed = 0
+    for start in starts:
+        # Slice gaps are g[start:end]; keep a deque of their running max
+        end = start + window - 1
+        while pushed < end:
+            while window_max and g[window_max[-1]] <= g[pushed]:
+                window_max.pop()
+            window_max.append(pushed)
+            pushed += 1
+        while window_max[0] < start:
+            window_max.popleft()
+        top = g[window_max[0]]
+        scores.append(round(_gap_score(g[start:start + m], top), 3) if top else 0)
+    return scores
+
+
+@_inst.instrumented
+def find_gap_pattern(series, top_k=5, allow_scale=True, presorted=False):
+    """
+    Find where the Coralia gap pattern occurs inside a long series.
+    Slides the 11-gap template over the gaps of the sorted series.
+    With allow_scale, each window is normalized by its largest gap, so
+    its score equals gap_match on those 12 values; otherwise raw gaps
+    are compared at the template's own scale.
+    presorted=True skips the sort for ascending input.
+    Returns the top_k {"offset", "scale", "score"} dicts, best first.
+    """
+    timer = _inst.Timer("find_gap_pattern") if _inst.enabled else None
+    np = numpy()
+    if not hasattr(series, "__len__"):
+        series = list(series)
+    if len(series) < 2 or top_k < 1:
+        return []
+    if np is not None:
+        # Buffers become arrays over the same memory, unless too narrow
+        s = _widen(np.asarray(series))
+        g = np.diff(s if presorted else np.sort(s))
+    else:
+        s = scalars(series)
+        if not presorted:
+            s = sorted(s)
+        g = [s[i+1] - s[i] for i in range(len(s) - 1)]
+    if timer:
+        timer.lap("sort")
+    m = len(norm_gaps)
+    if len(g) < m:
+        m = len(g)
+
+    if np is not None:
+        windows = np.lib.stride_tricks.sliding_window_view(g, m)
+        top = windows.max(axis=1) if allow_scale else np.full(len(windows), max(gaps))
+        live = top != 0
+        safe = np.where(live, top, 1)
+        diff = np.zeros(len(windows))
+        for i in range(m):
+            diff += np.abs(windows[:, i] / safe - norm_gaps[i])
+        score = np.where(live, np.maximum(0, 1 - diff / m), 0)
+        k = min(top_k, len(score))
+        cut = np.partition(score, len(score) - k)[len(score) - k]
+        offsets = np.flatnonzero(score >= cut)
+        offsets = offsets[np.lexsort((offsets, -score[offsets]))][:k]
+        best = [(score[i], i, top[i]) for i in offsets.tolist()]
+    else:
+        heap = []
+        window_max = deque()
+        for i, x in enumerate(g):
+            while window_max and g[window_max[-1]] <= x:
+                window_max.pop()
+            window_max.append(i)
+            start = i - m + 1
+            if start < 0:
+                continue
+            if window_max[0] < start:
+                window_max.popleft()
+            top = g[window_max[0]] if allow_scale else max(gaps)
+            score = 0
+            if top != 0:
+                # With the top_k full, stop once even a perfect remainder
+                # cannot reach its worst; until then every window counts
+                floor = heap[0][0] if len(heap) == top_k else None
+                diff = 0
+                for j in range(m):
+                    diff += abs(g[start + j] / top - norm_gaps[j])
+                    if floor is not None and 1 - diff / m < floor:
+                        break
+                else:
+                    score = max(0, 1 - diff / m)
+                if floor is not None and 1 - diff / m < floor:
+                    continue
+            entry = (score, -start, top)
+            if len(heap) < top_k:
+                heappush(heap, entry)
+            elif entry > heap[0]:
+                heappushpop(heap, entry)
+        best = [(score, -neg, top) for score, neg, top in sorted(heap, reverse=True)]
+
+    if timer:
+        timer.lap("scan")
+
+    scale = max(gaps) if allow_scale else None
+    return [{"offset": int(i),
+             "scale": float(top) / scale if scale else 1.0,
+             "score": round(float(score), 3)} for score, i, top in best]
+
+
+@_inst.instrumented
+def coherence_score(data, presorted=False):
     """
     Calculate alignment with Coralia structure.
     Returns score 0-1 with interpretation.
+    Takes buffers and presorted as gap_match does.
     """
-    if not data:
+    return backends.active().coherence_score(data, presorted)
+
+
+def _coherence_score(data, presorted=False):
+    """Pure-Python coherence_score."""
+    if not len(data):
         return {"score": 0, "interpretation": "No data"}
 
+    timer = _inst.Timer("coherence_score") if _inst.enabled else None
     c_set = set(C)
     hits = sum(1 for x in data if x in c_set)
     element_score = hits / len(data)
+    if timer:
+        timer.lap("elements")
 
-    gap_result = gap_match(data) if len(data) > 1 else {"score": 0}
+    gap_result = _nested_gap_match(data, presorted) if len(data) > 1 else {"score": 0}
     gap_score = gap_result.get("score", 0)
+    if timer:
+        timer.lap("gap_match")
 
     combined = (element_score + gap_score) / 2
 
-    if combined > 0.8:
-        interp = "Strong alignment"
-    elif combined > 0.5:
-        interp = "Moderate alignment"
-    elif combined > 0.2:
-        interp = "Weak alignment"
-    else:
-        interp = "No significant alignment"
-
     return {
         "score": round(combined, 3),
         "element_score": round(element_score, 3),
         "gap_score": round(gap_score, 3),
-        "interpretation": interp
+        "interpretation": _interpret(combined)
     }
+
+
+def _interpret(combined):
+    """Interpretation band of a combined coherence score."""
+    return interpretations[_interpret_code(combined)]
+
+
+def _interpret_code(combined):
+    """
+    Code (1-4) of the interpretation band of a combined score.
+    Works elementwise on NumPy arrays too.
+    """
+    return 1 + (combined > 0.2) + (combined > 0.5) + (combined > 0.8)
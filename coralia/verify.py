@@ -1,7 +1,16 @@
 """Verification tools."""
 
+from bisect import bisect_right
+
+from . import backends
 from .sequence import C, gaps
 
+axiom_names = (
+    "C1_origin", "C2_cardinality_in_set", "C3_cardinality", "C4_ceiling",
+    "C5_gap_sum", "C6a_gap_vocabulary", "C6b_gap_monotonic", "C6c_seed",
+    "C7_terminal_descent", "C8_terminal_fib_luc", "C9_terminal_min",
+)
+
 
 def verify_uniqueness():
     """
@@ -58,3 +67,142 @@ def check_axioms(sequence):
         "C9_terminal_min": all(x >= 5 for x in g[8:]),
         "valid": True
     }
+
+
+def check_axioms_batch(candidates, per_axiom=False, short_circuit=False):
+    """
+    Check axioms on every row of an (N, 12) integer matrix.
+
+    Returns an (N,) pass mask, or with `per_axiom` an (N, 11) matrix in
+    `axiom_names` order. With `short_circuit`, a row is dropped at its
+    first failing axiom and later axioms only run on the survivors;
+    their columns then read False for dropped rows.
+    """
+    return backends.active().check_axioms_batch(candidates, per_axiom, short_circuit)
+
+
+def _check_axioms_batch(candidates, per_axiom=False, short_circuit=False):
+    """Pure-Python check_axioms_batch: check_axioms row by row."""
+    rows = []
+    for row in candidates:
+        result = check_axioms(row)
+        if "error" in result:
+            raise ValueError(result["error"])
+        checks = [result[name] for name in axiom_names]
+        if short_circuit and not all(checks):
+            first = checks.index(False)
+            checks[first:] = [False] * (len(checks) - first)
+        rows.append(checks)
+    return rows if per_axiom else [all(r) for r in rows]
+
+
+def fib_luc(bound):
+    """Positive Fibonacci and Lucas numbers up to bound."""
+    result = set()
+    for a, b in ((1, 1), (2, 1)):
+        while a <= bound:
+            result.add(a)
+            a, b = b, a + b
+    return result
+
+
+def solve_axioms(ceiling=35, cardinality=12, vocabulary=(1, 2, 3),
+                 terminal=3, terminal_min=5, fib_luc_bound=None,
+                 seed=(1, 2, 3, 5, 7, 9, 15)):
+    """
+    Yield every set satisfying axioms C1-C9 under the given parameters.
+
+    C1  0 is in the set           C2  `cardinality` is in the set
+    C3  |set| = `cardinality`     C4/C5  max = gap sum = `ceiling`
+    C6  leading gaps drawn from `vocabulary`, non-decreasing,
+        and `seed` is a subset
+    C7-C9  the last `terminal` gaps strictly descend, are Fibonacci or
+        Lucas numbers up to `fib_luc_bound` (default `ceiling`), and
+        are at least `terminal_min`
+
+    Backtracks over runs of equal leading gaps, then over terminal gaps,
+    pruning on reachable gap sum and on required members a gap would
+    step over. On the defaults it yields C alone.
+    """
+    head_len = cardinality - 1 - terminal
+    if head_len < 0 or terminal < 0:
+        return
+    vocab = sorted(set(vocabulary))
+    if head_len and not vocab:
+        return
+    bound = ceiling if fib_luc_bound is None else fib_luc_bound
+    parts = sorted(x for x in fib_luc(min(bound, ceiling)) if x >= terminal_min)
+    if len(parts) < terminal:
+        return
+    required = sorted(set(seed) | {cardinality})
+    if required and (required[0] < 0 or required[-1] > ceiling):
+        return
+
+    # low[n]: smallest sum of n distinct parts; high: largest of `terminal`
+    low = [0]
+    for p in parts:
+        low.append(low[-1] + p)
+    high = sum(parts[len(parts) - terminal:])
+
+    def on_lattice(pos, end, g):
+        """True if every required member in (pos, end] is pos + j*g."""
+        i, j = bisect_right(required, pos), bisect_right(required, end)
+        return all((q - pos) % g == 0 for q in required[i:j])
+
+    def tail(pos, n, upper, out):
+        """Strictly descending terminal gaps below parts[upper]."""
+        rest = ceiling - pos
+        if n == 0:
+            if rest == 0:
+                yield list(out)
+            return
+        if upper < n or rest < low[n] or rest > sum(parts[upper - n:upper]):
+            return
+        for i in range(upper - 1, n - 2, -1):
+            g = parts[i]
+            if g > rest - low[n - 1]:
+                continue
+            if rest - g > sum(parts[i - n + 1:i]):
+                break
+            if not on_lattice(pos, pos + g, g):
+                continue
+            out.append(pos + g)
+            yield from tail(pos + g, n - 1, i, out)
+            out.pop()
+
+    tails = {}
+
+    def head(pos, n, first, runs):
+        """Leading gaps as runs of vocab[first], vocab[first + 1], ..."""
+        if n == 0:
+            if pos not in tails:
+                tails[pos] = list(tail(pos, terminal, len(parts), []))
+            for points in tails[pos]:
+                solution = [0]
+                for start, end, g in runs:
+                    solution.extend(range(start + g, end + 1, g))
+                yield solution + points
+            return
+
+        g = vocab[first]
+        if first == len(vocab) - 1:
+            later, counts = g, [n]
+        else:
+            later = vocab[first + 1]
+            # Shorter runs leave too much for the larger gaps that follow
+            need = low[terminal] + pos + n * later - ceiling
+            counts = range(max(0, -(-need // (later - g))), n + 1)
+        for c in counts:
+            end = pos + c * g
+            if not on_lattice(pos, end, g):
+                break
+            rest = ceiling - end
+            if rest > (n - c) * vocab[-1] + high:
+                break
+            if rest < (n - c) * later + low[terminal]:
+                continue
+            runs.append((pos, end, g))
+            yield from head(end, n - c, first + 1, runs)
+            runs.pop()
+
+    yield from head(0, head_len, 0, [])
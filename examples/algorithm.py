@@ -27,6 +27,7 @@ def analyze():
     print("  Zone 4: Convergence acceleration")
     print()
     print("Test: Compare C-scheduled checkpoints to linear")
+    print("Run it: python -m coralia.schedule")
 
 if __name__ == "__main__":
     analyze()
@@ -27,6 +27,7 @@ def analyze():
     print("  Zone 4: Large blocks for redundancy")
     print()
     print("Test: Compare C-sized blocks to standard schemes")
+    print("  python -m coralia.chunk [FILE ...]")
 
 if __name__ == "__main__":
     analyze()
@@ -20,6 +20,7 @@ def analyze():
     print("  Zone 4: Sympathetic cascade (stress/exertion)")
     print()
     print("Test: Map RR intervals to zones, check distribution")
+    print("Files: coralia.ingest.ingest(path, epoch_size) → zones per epoch")
 
 if __name__ == "__main__":
     analyze()
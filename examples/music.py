@@ -24,6 +24,7 @@ def analyze():
     print("  Zone 4 [8,7,5]: Large interval cascade")
     print()
     print("Terminal triple (8,7,5) = tension → resolution")
+    print("Scan note streams for C mod 12 in any key: coralia.pitch.scan")
 
 if __name__ == "__main__":
     analyze()
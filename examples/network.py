@@ -27,6 +27,7 @@ def analyze():
     print("  Zone 4: Adaptive/burst handling")
     print()
     print("Test: Compare C-timing to optimal network configs")
+    print("Retry/backoff schedules: coralia.schedule.coralia_waits, retry")
 
 if __name__ == "__main__":
     analyze()
@@ -26,6 +26,7 @@ def analyze():
     print("  Zone 4: Cascade/burst patterns")
     print()
     print("Test: Map EEG frequency ratios to C elements")
+    print("  Multichannel: coralia.channels.analyze_channels(eeg, window=256)")
 
 if __name__ == "__main__":
     analyze()
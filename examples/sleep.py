@@ -23,6 +23,7 @@ def analyze():
     print()
     print("Terminal cascade [8, 7, 5] as overnight progression")
     print("43% cliff at position 15/35 = sleep architecture inflection")
+    print("Files: coralia.ingest.ingest(path, epoch_size) → zones per epoch")
 
 if __name__ == "__main__":
     analyze()
@@ -0,0 +1,13 @@
+import pytest
+
+from coralia import _compat
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with and without NumPy."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(_compat, "_numpy", None)
+    return request.param
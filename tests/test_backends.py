@@ -0,0 +1,112 @@
+import random
+import subprocess
+import sys
+from array import array
+
+import pytest
+
+from coralia import C, backends
+
+np = pytest.importorskip("numpy")
+
+
+def sequences():
+    rng = random.Random(21)
+    yield []
+    yield [5]
+    yield [7, 7, 7]
+    yield list(C)
+    yield [rng.randint(0, 40) for _ in range(20)]
+    yield [rng.randint(0, 40) for _ in range(1000)]
+    yield [rng.uniform(-5, 50) for _ in range(300)]
+    yield [rng.randint(0, 3) for _ in range(500)] + [2.5, 1e9]
+
+
+def pairs(backend):
+    """Each sequence, plus its ndarray form for the NumPy backend."""
+    for s in sequences():
+        yield s, s
+        if backend.name == "numpy":
+            yield s, np.array(s, dtype=float if any(isinstance(x, float) for x in s) else int)
+
+
+@pytest.fixture(params=backends.available())
+def other(request):
+    return backends.get(request.param)
+
+
+def test_gap_match_parity(other):
+    reference = backends.get("python")
+    for s, arg in pairs(other):
+        assert other.gap_match(arg) == reference.gap_match(s)
+
+def test_coherence_score_parity(other):
+    reference = backends.get("python")
+    for s, arg in pairs(other):
+        assert other.coherence_score(arg) == reference.coherence_score(s)
+
+def test_narrow_buffer_parity(other):
+    reference = backends.get("python")
+    rng = random.Random(15)
+    for buf in (array("b", [-100] * 200 + [100] * 200),
+                array("h", [rng.randint(-30000, 30000) for _ in range(300)]),
+                array("f", [rng.uniform(-1e6, 1e6) for _ in range(300)])):
+        assert other.gap_match(buf) == reference.gap_match(list(buf))
+        assert other.coherence_score(buf) == reference.coherence_score(list(buf))
+    assert other.gap_match(array("b", [-100] * 200 + [100] * 200))["score"] == 0.602
+
+def test_detect_zones_parity(other):
+    reference = backends.get("python")
+    for s, arg in pairs(other):
+        for ceiling in (35, 100, [70] * len(s)):
+            assert list(other.detect_zones(arg, ceiling)) == list(reference.detect_zones(s, ceiling))
+
+def test_row_kernels_parity(other):
+    reference = backends.get("python")
+    rng = random.Random(3)
+    rows = [[rng.randint(0, 40) for _ in range(15)] for _ in range(300)] + [[4] * 15]
+    for width in (0, 1, 2, 15):
+        cut = [row[:width] for row in rows]
+        m = np.array(cut).reshape(len(cut), width) if other.name == "numpy" else cut
+        for kernel in ("gap_columns", "coherence_columns"):
+            result = getattr(other, kernel)(m)
+            expected = getattr(reference, kernel)(cut)
+            assert [list(c) for c in result] == [list(c) for c in expected]
+
+def test_narrow_matrix_parity(other):
+    rng = random.Random(8)
+    rows = [[-100, -90, -80, 100, 110, 120]] + \
+        [[rng.randint(-128, 127) for _ in range(6)] for _ in range(50)]
+    expected = [backends.get("python").gap_match(row).get("score") for row in rows]
+    assert list(other.gap_columns(np.array(rows, dtype=np.int8))[0]) == expected
+    assert expected[0] == 0.719
+    candidates = [list(C)] + [sorted(rng.sample(range(36), 12)) for _ in range(50)]
+    assert np.array_equal(np.asarray(other.check_axioms_batch(np.array(candidates, dtype=np.int8))),
+                          np.asarray(other.check_axioms_batch(candidates)))
+
+def test_check_axioms_batch_parity(other):
+    reference = backends.get("python")
+    rng = random.Random(5)
+    rows = [list(C)] + [sorted(rng.sample(range(36), 12)) for _ in range(300)]
+    for per_axiom in (False, True):
+        for short_circuit in (False, True):
+            expected = reference.check_axioms_batch(rows, per_axiom, short_circuit)
+            m = np.array(rows) if other.name == "numpy" else rows
+            result = other.check_axioms_batch(m, per_axiom, short_circuit)
+            assert np.array_equal(np.asarray(result), np.asarray(expected))
+
+def test_use_switches_backend():
+    try:
+        backends.use("python")
+        assert backends.active().name == "python"
+        backends.use("numpy")
+        assert backends.active().name == "numpy"
+    finally:
+        backends._compat._numpy = False
+
+def test_import_is_lazy_and_env_override():
+    code = ("import sys, coralia; assert 'numpy' not in sys.modules; "
+            "coralia.gap_match(list(range(1000))); print(coralia.backends.active().name)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         env={"CORALIA_BACKEND": "python", "PYTHONPATH": "."}, check=True)
+    assert out.stdout.strip() == "python"
@@ -0,0 +1,21 @@
+from benchmarks.__main__ import main
+from benchmarks.runner import compare, percentile, run_suite
+
+
+def test_run_suite_records_every_size():
+    record = run_suite(max_size=100, only=["detect_zones", "gap_match"], budget=0)
+    assert [(r["case"], r["size"]) for r in record["results"]] == [
+        ("detect_zones", 10), ("detect_zones", 100), ("gap_match", 10), ("gap_match", 100)]
+    assert all(r["p50"] <= r["p90"] <= r["p99"] and r["throughput"] > 0 for r in record["results"])
+
+def test_compare_flags_regressions():
+    base = {"results": [{"case": "a", "size": 10, "p50": 1.0}, {"case": "b", "size": 10, "p50": 1.0}]}
+    head = {"results": [{"case": "a", "size": 10, "p50": 1.05}, {"case": "b", "size": 10, "p50": 1.5}]}
+    assert [row[-1] for row in compare(base, head, 0.10)] == [False, True]
+
+def test_percentile():
+    assert [percentile(list(range(1, 101)), q) for q in (50, 90, 99)] == [50, 90, 99]
+
+def test_compare_without_history(tmp_path, capsys):
+    assert main(["compare", str(tmp_path / "missing.jsonl")]) == 2
+    assert "no history file" in capsys.readouterr().err
@@ -0,0 +1,34 @@
+from itertools import combinations
+
+from coralia.cascade import cascade_table, cascades, count_cascades, parts
+from coralia.verify import fib_luc
+
+
+def brute(target, k, floor):
+    pool = sorted((p for p in fib_luc(target) if p >= floor), reverse=True)
+    return [c for c in combinations(pool, k) if sum(c) == target]
+
+def test_cascade_triple_of_20():
+    assert count_cascades(20, 3) == 6
+    assert list(cascades(20, 3, floor=5)) == [(8, 7, 5)]
+
+def test_matches_brute_force():
+    for target in range(40):
+        for k in range(5):
+            for floor in (1, 2, 5):
+                expected = brute(target, k, floor)
+                assert list(cascades(target, k, floor)) == expected
+                assert count_cascades(target, k, floor) == len(expected)
+
+def test_table_matches_counts(backend):
+    floors = [1, 3, 6, 8, 100]
+    table = cascade_table(45, 4, floors)
+    assert list(table) == floors
+    for floor, rows in table.items():
+        assert [list(row) for row in rows] == \
+            [[count_cascades(t, k, floor) for t in range(46)] for k in range(5)]
+
+def test_large_target():
+    assert parts(50000)[0] == 46368
+    assert count_cascades(50000, 10) == sum(1 for _ in cascades(50000, 10)) == 20383
+    assert cascade_table(50000, 10, floors=[1])[1][10][50000] == 20383
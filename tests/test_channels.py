@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from coralia import C, coherence_score, detect_zones, rolling_gap_match
+from coralia.channels import (analyze_channels, channel_coherence, channel_gap_match,
+                              channel_zones, main)
+
+rng = random.Random(25)
+DATA = [[rng.uniform(0, 35) for _ in range(300)] for _ in range(5)]
+DATA[2][40:52] = C
+
+
+def expected(rows, window, step):
+    starts = range(0, len(rows[0]) - window + 1, step)
+    return {"zones": [list(detect_zones(r)) for r in rows],
+            "gap_match": [list(rolling_gap_match(r, window, step)) for r in rows],
+            "coherence": [[coherence_score(r[s:s + window])["score"] for s in starts]
+                          for r in rows]}
+
+def rows(matrix):
+    return [list(r) for r in matrix]
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_matches_single_channel_tools(backend, workers):
+    result = analyze_channels(DATA, window=12, step=4, workers=workers)
+    want = expected(DATA, 12, 4)
+    for name in want:
+        assert rows(result[name]) == want[name], name
+    assert max(result["gap_match"][2]) == 1.0
+
+def test_single_outputs(backend):
+    assert rows(channel_zones(DATA, workers=2)) == expected(DATA, 12, 4)["zones"]
+    assert rows(channel_gap_match(DATA, 50, 7, workers=2)) == expected(DATA, 50, 7)["gap_match"]
+    assert rows(channel_coherence(DATA[:1], 400)) == [[]]
+    assert set(analyze_channels(DATA, 12, wanted=("coherence",), workers=1)) == {"coherence"}
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        analyze_channels([[1, 2], [3]])
+    with pytest.raises(ValueError):
+        analyze_channels(DATA, window=0)
+    with pytest.raises(ValueError):
+        analyze_channels(DATA, wanted=("spectrum",))
+
+def test_cli(capsys):
+    main(["--channels", "4", "--seconds", "2", "--rate", "64", "--window", "32",
+          "--workers", "2"])
+    assert "4 channels x 128 samples" in capsys.readouterr().out
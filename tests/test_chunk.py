@@ -0,0 +1,46 @@
+import io
+from itertools import islice
+
+import pytest
+
+from coralia import gaps
+from coralia.chunk import (benchmark, codecs, compress_blocks, corpora, decompress_blocks,
+                           fixed_sizes, gap_sizes, iter_blocks, main, zone_sizes)
+
+
+def test_sizes_follow_patterns():
+    assert list(islice(gap_sizes(35 / 11), 22)) == gaps * 2
+    assert list(islice(fixed_sizes(4096), 3)) == [4096] * 3
+    zone = list(islice(zone_sizes(3000), 11))
+    assert zone[:3] == [zone[0]] * 3 and zone[-3:] == [zone[-1]] * 3
+    assert abs(sum(zone) - 33000) < 11
+    with pytest.raises(ValueError):
+        gap_sizes(0)
+
+def test_blocks_are_views_of_input():
+    data = bytes(range(256)) * 10
+    blocks = list(iter_blocks(data, gap_sizes(100)))
+    assert all(isinstance(b, memoryview) and b.obj is data for b in blocks)
+    assert b"".join(blocks) == data
+    assert [len(b) for b in blocks[:11]] == [round(g * 1100 / 35) for g in gaps]
+    from_file = list(iter_blocks(io.BytesIO(data), gap_sizes(100)))
+    assert [bytes(b) for b in from_file] == [bytes(b) for b in blocks]
+    assert list(iter_blocks(b"", fixed_sizes(8))) == []
+
+@pytest.mark.parametrize("codec", sorted(codecs))
+@pytest.mark.parametrize("workers", [None, 3])
+def test_round_trip(codec, workers):
+    data = corpora(1 << 14)["mixed"]
+    frames = list(compress_blocks(iter_blocks(data, zone_sizes(1000)), codec, 1, workers))
+    assert b"".join(decompress_blocks(frames, codec)) == data
+
+def test_benchmark_and_cli(tmp_path, capsys):
+    result = benchmark({"text": corpora(1 << 14)["text"]}, block_size=2048, repeats=1)
+    row = result["text"]["gap"]
+    assert set(result["text"]) == {"gap", "zone", "fixed"}
+    assert row["ratio"] > 1 and row["mb_s"] > 0 and row["peak_bytes"] > 0
+    path = tmp_path / "corpus.bin"
+    path.write_bytes(b"coralia " * 4096)
+    main([str(path), "--block-size", "4096", "--repeats", "1", "--workers", "2"])
+    out = capsys.readouterr().out
+    assert out.count("corpus.bin") == 3
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+import pytest
+
+from coralia import C, coherence_score
+from coralia.cli import iter_blocks, iter_records, iter_windows, main
+
+
+class Chunky:
+    """Text stream returning a few characters per read."""
+
+    def __init__(self, text, size=5):
+        self.text, self.size = text, size
+
+    def read(self, n):
+        head, self.text = self.text[:self.size], self.text[self.size:]
+        return head
+
+
+def test_blocks_split_across_reads(backend):
+    text = " ".join(str(x) for x in range(200)) + "\n1.5,2.25"
+    values = [x for block in iter_blocks(Chunky(text, 7)) for x in block]
+    assert values == list(range(200)) + [1.5, 2.25]
+
+def test_windows(backend):
+    blocks = iter_blocks(Chunky(" ".join(map(str, range(50))), 11))
+    windows = [list(w) for w in iter_windows(blocks, 10, 7)]
+    assert windows == [list(range(i, i + 10)) for i in range(0, 41, 7)]
+
+def test_records_and_workers(tmp_path, capsys):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.txt"
+        path.write_text(" ".join(map(str, C)) + f"\n{i} 40\n")
+        paths.append(str(path))
+    main(paths + ["--workers", "2"])
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["source"], r["index"]) for r in rows] == [(p, i) for p in paths for i in (0, 1)]
+    assert rows[0]["coherence"] == coherence_score(C)["score"] and rows[0]["zones"] == [4, 3, 2, 3]
+
+def test_window_csv(tmp_path, capsys):
+    path = tmp_path / "stream.txt"
+    path.write_text("\n".join(map(str, C * 3)))
+    main([str(path), "--window", "12", "--step", "12", "--format", "csv"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("source,index,n,zone_1")
+    assert len(lines) == 4 and lines[1].endswith(",1.0,1.0,Strong alignment")
+
+def test_csv_quotes_source(tmp_path, capsys):
+    path = tmp_path / "a,b.txt"
+    path.write_text(" ".join(map(str, C)) + "\n")
+    main([str(path), "--format", "csv"])
+    header, row = csv.reader(io.StringIO(capsys.readouterr().out))
+    assert len(row) == len(header) == 10 and row[0] == str(path)
+
+def test_bad_token_names_its_line(backend, tmp_path, capsys):
+    with pytest.raises(ValueError, match="line 3: not a number: 'x'"):
+        list(iter_blocks(Chunky("1 2\n3\n4 x 5\n6", 3)))
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_records(io.StringIO("1 2\nnan y\n")))
+    path = tmp_path / "bad.txt"
+    path.write_text("1 2 3\n4 five\n")
+    with pytest.raises(SystemExit):
+        main([str(path)])
+    assert "bad.txt: line 2: not a number: 'five'" in capsys.readouterr().err
@@ -0,0 +1,46 @@
+import asyncio
+import random
+
+from coralia import CrossingDetector, detect_crossings
+from coralia.crossing import crossings_async
+
+
+def walk(n=3000, seed=9):
+    rng = random.Random(seed)
+    x, out = 10.0, []
+    for _ in range(n):
+        x = min(max(x + rng.gauss(0, 1.5), 0), 35)
+        out.append(x)
+    return out
+
+
+def test_batch_matches_stream(backend):
+    values = walk()
+    for band in (0.0, 0.5, [1, 0, 2]):
+        events = []
+        detector = CrossingDetector(band=band, callback=events.append)
+        for t, x in enumerate(values):
+            detector.update(x, t)
+        assert detect_crossings(values, band=band) == events
+        assert events
+
+def test_hysteresis_suppresses_chatter(backend):
+    values = [6.0, 6.3, 6.2, 6.3, 6.2, 6.3, 8.0, 4.0]
+    assert len([e for e in detect_crossings(values) if e.index == 1]) == 6
+    events = [e for e in detect_crossings(values, band=0.5) if e.index == 1]
+    assert [(e.direction, e.time, e.dwell) for e in events] == [(1, 6, 6), (-1, 7, 1)]
+
+def test_ceiling_and_times(backend):
+    events = detect_crossings([0, 50, 100], times=[0.0, 1.5, 3.0], ceiling=100)
+    assert [(e.name, e.time) for e in events] == [("lambda_1", 1.5), ("lambda_2", 3.0), ("lambda_3", 3.0)]
+
+def test_async():
+    async def source():
+        for t, x in enumerate([0, 30, 0]):
+            yield (t * 2, x)
+
+    async def collect():
+        return [e async for e in crossings_async(source())]
+
+    events = asyncio.run(collect())
+    assert [(e.index, e.direction, e.time) for e in events] == [(1, 1, 2), (2, 1, 2), (3, 1, 2), (1, -1, 4), (2, -1, 4), (3, -1, 4)]
@@ -0,0 +1,51 @@
+import itertools
+
+from coralia import C, generate, iter_zones, zones
+from coralia.family import count_zone_specs, zone_specs
+
+C_SPEC = (((1, 3),), ((2, 3),), ((3, 2),), ((8, 1), (7, 1), (5, 1)))
+
+
+def brute(ceiling, cardinality, n_zones, vocabulary, max_runs):
+    found = []
+    for g in itertools.product(vocabulary, repeat=cardinality - 1):
+        if sum(g) != ceiling:
+            continue
+        for cuts in itertools.combinations(range(1, cardinality - 1), n_zones - 1):
+            bounds = (0, *cuts, cardinality - 1)
+            spec = tuple(tuple((gap, len(list(run))) for gap, run in itertools.groupby(g[a:b]))
+                         for a, b in zip(bounds, bounds[1:]))
+            if all(len(zone) <= max_runs for zone in spec):
+                found.append(spec)
+    return sorted(found)
+
+def test_generate_unchanged():
+    assert generate() == C
+    assert list(iter_zones(zones)) == C
+    assert list(iter_zones(C_SPEC)) == C
+
+def test_iter_zones_is_lazy():
+    endless = iter_zones([{"runs": [(2, 1)], "repeat": 10 ** 12}])
+    assert list(itertools.islice(endless, 5)) == [0, 2, 4, 6, 8]
+
+def test_iter_zones_overlapping_starts():
+    spec = [{"gaps": [2, 2, 2]}, {"start": 1, "runs": [(1, 4)]}, {"runs": [(-3, 1)]}]
+    assert list(iter_zones(spec)) == [0, 2, 4, 6, 3, 5]
+
+def test_zone_specs_match_brute_force():
+    for args in [(10, 5, 2, (1, 2, 3), 2), (12, 7, 3, (1, 2, 4), 2), (9, 6, 1, (1, 2), 3)]:
+        specs = list(zone_specs(*args))
+        assert sorted(specs) == brute(*args)
+        assert count_zone_specs(*args) == len(specs)
+        assert all(list(iter_zones(s))[-1] == args[0] for s in specs)
+
+def test_count_zone_specs_full_space():
+    assert count_zone_specs() == 1490098880
+    # One single-gap zone per gap: just the gap tuples with the right sum
+    tuples = sum(sum(g) == 10 for g in itertools.product((1, 2, 3), repeat=4))
+    assert count_zone_specs(10, 5, 4, (1, 2, 3), max_runs=1) == tuples
+
+def test_zone_specs_contains_c():
+    single = tuple((run,) for zone in C_SPEC for run in zone)
+    assert list(iter_zones(single)) == C
+    assert single in zone_specs(35, 12, 6, (1, 2, 3, 5, 7, 8), max_runs=1)
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from coralia import C, gap_match
+from coralia.index import GapIndex, gap_vector
+
+
+def corpus(n=600, seed=12):
+    rng = random.Random(seed)
+    return [sorted(rng.sample(range(60), rng.randint(2, 16))) for _ in range(n)] + [C]
+
+
+def brute(sequences, query, k):
+    q = gap_vector(query)
+    scored = []
+    for i, s in enumerate(sequences):
+        v = gap_vector(s)
+        m = min(len(v), len(q))
+        score = max(0, 1 - sum(abs(v[j] - q[j]) for j in range(m)) / m)
+        scored.append((-score, i))
+    return [{"id": i, "score": round(-s, 3)} for s, i in sorted(scored)[:k]]
+
+
+def test_top_k_matches_gap_match(backend):
+    sequences = corpus()
+    index = GapIndex()
+    index.extend(sequences)
+    best = index.top_k(k=20)
+    assert best[0] == {"id": len(sequences) - 1, "score": 1.0}
+    assert best == brute(sequences, C, 20)
+    assert all(r["score"] == gap_match(sequences[r["id"]])["score"] for r in best)
+
+def test_short_query_and_incremental_adds(backend):
+    sequences = corpus()
+    index = GapIndex()
+    index.extend(sequences[:300])
+    for s in sequences[300:]:
+        index.add(s)
+    query = [0, 2, 3, 7, 8]
+    assert index.top_k(query, k=15) == brute(sequences, query, 15)
+
+def test_save_load_roundtrip(backend, tmp_path):
+    sequences = corpus()
+    index = GapIndex()
+    index.extend(sequences)
+    path = tmp_path / "corpus.cgix"
+    index.save(str(path))
+    loaded = GapIndex.load(str(path))
+    assert len(loaded) == len(sequences)
+    assert loaded.top_k(k=10) == index.top_k(k=10)
+    loaded.add(C, id=-1)
+    assert loaded.top_k(k=2) == [{"id": -1, "score": 1.0}, {"id": len(sequences) - 1, "score": 1.0}]
+
+def test_ids_stay_unique():
+    index = GapIndex()
+    assert index.add(C, id=1) == 1
+    assert index.extend([C, C, C]) == [0, 2, 3]
+    assert index.extend([C, C], ids=[10, 11]) == [10, 11]
+    assert index.add(C) == 4
+    with pytest.raises(ValueError):
+        index.add(C, id=10)
+    with pytest.raises(ValueError):
+        index.extend([C], ids=[7, 8])
+    assert sorted(r["id"] for r in index.top_k(k=10)) == [0, 1, 2, 3, 4, 10, 11]
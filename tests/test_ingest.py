@@ -0,0 +1,38 @@
+import random
+from array import array
+
+from coralia import coherence_score, detect_zone
+from coralia.ingest import epochs, ingest
+
+
+def expected(values, epoch_size):
+    for i in range(0, len(values), epoch_size):
+        epoch = values[i:i + epoch_size]
+        zones = [detect_zone(x, 40) for x in epoch]
+        yield {"epoch": i // epoch_size, "n": len(epoch),
+               "zones": [zones.count(k) for k in (1, 2, 3, 4)],
+               "coherence": coherence_score(epoch)}
+
+
+def sample():
+    rng = random.Random(8)
+    return [float(rng.randint(0, 40)) for _ in range(1000)]
+
+
+def test_text_ingest(backend, tmp_path):
+    values = sample()
+    path = tmp_path / "rr.csv"
+    path.write_text("t,rr\n" + "".join(f"{i},{x}\n" for i, x in enumerate(values)))
+    result = ingest(str(path), 64, ceiling=40, chunk_size=100, column=1, delimiter=",", skip=1)
+    assert list(result) == list(expected(values, 64))
+
+def test_binary_ingest(backend, tmp_path):
+    values = sample()
+    path = tmp_path / "rr.f64"
+    path.write_bytes(array("d", values).tobytes() + b"\0")
+    result = ingest(str(path), 90, typecode="d", ceiling=40, chunk_size=37)
+    assert list(result) == list(expected(values, 90))
+
+def test_epochs_regroup(backend):
+    chunks = [array("d", range(i, i + 7)) for i in range(0, 35, 7)]
+    assert [list(e) for e in epochs(chunks, 10)] == [list(range(i, min(i + 10, 35))) for i in range(0, 35, 10)]
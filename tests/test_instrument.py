@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+from coralia import C, coherence_score, detect_zone, detect_zones, instrument
+
+
+@pytest.fixture
+def recording():
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_records_nothing(recording):
+    coherence_score(C)
+    assert instrument.snapshot() == {}
+
+def test_calls_sizes_and_phases(recording):
+    instrument.enable()
+    coherence_score(C)
+    coherence_score(list(range(100)))
+    detect_zone(17)
+    detect_zones([1, 2, 3])
+    snap = instrument.snapshot()
+    assert snap["coherence_score"]["calls"] == 2
+    assert snap["coherence_score"]["sizes"] == {16: 1, 128: 1}
+    assert set(snap["coherence_score"]["phases"]) == {"elements", "gap_match"}
+    assert set(snap["gap_match"]["phases"]) == {"sort", "normalize"}
+    # coherence_score's own gap_match calls count, matching their phases
+    assert snap["gap_match"]["calls"] == 2
+    assert snap["gap_match"]["sizes"] == {16: 1, 128: 1}
+    assert all(p["calls"] == 2 for p in snap["gap_match"]["phases"].values())
+    assert snap["detect_zone"]["calls"] == 1
+    assert snap["detect_zones"]["phases"]["search"]["calls"] == 1
+    assert snap["gap_match"]["total_time"] > 0
+
+def test_sinks(recording):
+    out = io.StringIO()
+    seen = []
+    instrument.enable(instrument.JsonLinesSink(out), lambda *event: seen.append(event))
+    detect_zones(C)
+    assert json.loads(out.getvalue())["size"] == 12
+    assert seen[0][0] == "detect_zones"
+
+def test_json_sink_escapes_names(recording):
+    out = io.StringIO()
+    instrument.enable(instrument.JsonLinesSink(out))
+    instrument.record('say "hi"\n', 0.5, 3)
+    assert json.loads(out.getvalue()) == {"name": 'say "hi"\n', "elapsed": 0.5, "size": 3}
@@ -0,0 +1,25 @@
+import pytest
+
+from coralia import C, null_test
+
+
+def test_null_test_coralia_is_extreme(backend):
+    result = null_test(C, 500, seed=1, batch_size=100)
+    assert result["n_permutations"] == 500
+    assert result["percentile"] > 99
+    assert result["p_value"] < 0.01
+
+def test_null_test_deterministic_across_workers(backend):
+    a = null_test(C, 300, model="gap_shuffle", statistic="gap", seed=4, batch_size=100)
+    b = null_test(C, 300, model="gap_shuffle", statistic="gap", seed=4, batch_size=100, workers=2)
+    assert list(a["null"]) == list(b["null"])
+
+def test_null_test_early_stop(backend):
+    result = null_test(C, 100000, seed=2, batch_size=200, tol=0.01)
+    assert result["n_permutations"] < 100000
+
+def test_null_test_rejects_empty_runs():
+    with pytest.raises(ValueError):
+        null_test(C, 0)
+    with pytest.raises(ValueError):
+        null_test(C, 100, batch_size=0)
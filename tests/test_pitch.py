@@ -0,0 +1,45 @@
+import random
+
+from coralia import C
+from coralia.pitch import modes, pc_mask, rotation_table, scan, scan_chunks, transpose
+
+rng = random.Random(22)
+NOTES = [rng.randint(40, 90) for _ in range(2000)]
+for pos, r in [(100, 0), (500, 5), (1500, 11)]:
+    NOTES[pos:pos + 12] = [x + 60 + r for x in C]
+
+
+def brute(notes, window, mode):
+    target = pc_mask(C)
+    found = []
+    for i in range(len(notes) - window + 1):
+        m = pc_mask(notes[i:i + window])
+        for r in range(12):
+            t = transpose(target, r)
+            if {"equal": m == t, "contains": m & t == t, "within": m and not m & ~t}[mode]:
+                found.append((i, r))
+    return found
+
+def pairs(result):
+    return list(zip(list(result["positions"]), list(result["rotations"])))
+
+def test_rotations():
+    assert pc_mask(C) == pc_mask([0, 1, 2, 3, 5, 6, 7, 9, 11])
+    assert transpose(0b1, 13) == 0b10 and transpose(1 << 11, 1) == 1
+    assert rotation_table()[transpose(pc_mask(C), 5)] == 1 << 5
+
+def test_scan_matches_brute_force(backend):
+    for mode in modes:
+        for window in (1, 12, 13, 20):
+            result = scan(NOTES, window, mode=mode, batch_size=333)
+            assert pairs(result) == brute(NOTES, window, mode)
+            assert result["windows"] == len(NOTES) - window + 1
+
+def test_planted_transpositions(backend):
+    found = pairs(scan(NOTES))
+    assert {(100, 0), (500, 5), (1500, 11)} <= set(found)
+
+def test_scan_chunks_positions(backend):
+    chunks = [NOTES[i:i + 250] for i in range(0, len(NOTES), 250)]
+    results = list(scan_chunks(chunks, 12, mode="contains"))
+    assert [p for r in results for p in pairs(r)] == pairs(scan(NOTES, 12, mode="contains"))
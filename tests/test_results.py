@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from coralia import C, coherence_score, coherence_score_batch, gap_match, gap_match_batch
+from coralia._compat import numpy
+from coralia.results import interpretations, statuses
+
+rng = random.Random(16)
+RAGGED = [[], [4], [2, 2, 2], list(C), [rng.randint(0, 40) for _ in range(30)],
+          [rng.uniform(0, 35) for _ in range(12)]]
+SQUARE = [[rng.randint(0, 40) for _ in range(12)] for _ in range(200)] + [list(C), [9] * 12]
+
+
+def without_input_gaps(d):
+    return {k: v for k, v in d.items() if k != "input_gaps"}
+
+def test_batch_rows_match_scalar(backend):
+    for rows in (RAGGED, SQUARE):
+        assert list(gap_match_batch(rows)) == [without_input_gaps(gap_match(r)) for r in rows]
+        assert list(coherence_score_batch(rows)) == [coherence_score(r) for r in rows]
+
+def test_batch_columns(backend):
+    table = coherence_score_batch(RAGGED)
+    assert len(table) == len(RAGGED)
+    assert [interpretations[c] for c in table["interpretation"]] == \
+        [coherence_score(r)["interpretation"] for r in RAGGED]
+    assert [statuses[c] for c in gap_match_batch(RAGGED)["status"]][:3] == \
+        ["Sequence too short", "Sequence too short", "No variation"]
+
+def test_batch_2d_array():
+    np = pytest.importorskip("numpy")
+    m = np.array(SQUARE)
+    assert list(coherence_score_batch(m)["score"]) == [coherence_score(r)["score"] for r in SQUARE]
+
+def test_empty_rows_have_separate_columns(backend):
+    table = coherence_score_batch([[], []])
+    table["score"][0] = 9
+    assert list(table["element_score"]) == list(table["gap_score"]) == [0, 0]
+
+def test_buffers_zero_copy(backend):
+    table = gap_match_batch(SQUARE)
+    views = table.buffers()
+    assert views["score"].format == "d" and views["status"].format == "b"
+    assert views["score"].nbytes == 8 * len(SQUARE)
+    table["score"][0] = 0.5
+    assert views["score"][0] == 0.5
+
+def test_to_records():
+    if numpy() is None:
+        pytest.skip("NumPy not installed or disabled")
+    records = coherence_score_batch(SQUARE).to_records()
+    assert records.dtype.names == ("score", "element_score", "gap_score", "interpretation")
+    assert records[-2]["score"] == coherence_score(C)["score"]
+
+def test_to_arrow():
+    pa = pytest.importorskip("pyarrow")
+    batch = coherence_score_batch(SQUARE).to_arrow()
+    assert batch.num_rows == len(SQUARE)
+    assert isinstance(batch.column(3), pa.DictionaryArray)
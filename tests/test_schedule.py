@@ -0,0 +1,56 @@
+import asyncio
+import math
+
+import pytest
+
+from coralia import C, gaps
+from coralia.schedule import (checkpoints, compare, coralia_waits, exponential_waits,
+                              linear_waits, pace, retry, retry_async,
+                              simulate_checkpoints, simulate_retries)
+
+
+def test_waits_scale_to_budget():
+    assert list(coralia_waits(35)) == gaps
+    assert math.isclose(sum(coralia_waits(60)), 60)
+    assert math.isclose(sum(linear_waits(60)), 60) and len(list(linear_waits(60))) == 11
+    e = list(exponential_waits(60, factor=2))
+    assert math.isclose(sum(e), 60) and math.isclose(e[1], 2 * e[0])
+    assert list(checkpoints(35, coralia_waits(35))) == C[1:-1]
+
+def test_jitter_cap_repeat():
+    waits = list(coralia_waits(35, jitter=0.1, cap=7.5, seed=1))
+    assert all(0.9 * g <= w <= min(1.1 * g, 7.5) for g, w in zip(gaps, waits))
+    assert waits == list(coralia_waits(35, jitter=0.1, cap=7.5, seed=1))
+    forever = coralia_waits(35, repeat=True)
+    assert [next(forever) for _ in range(22)] == gaps * 2
+
+def test_retry_sync_and_async():
+    calls, slept = [], []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 4:
+            raise OSError("down")
+        return "ok"
+
+    assert retry(flaky, coralia_waits(35), sleep=slept.append) == "ok"
+    assert slept == gaps[:3]
+    assert list(pace(coralia_waits(35), sleep=slept.append)) == gaps
+
+    async def always_down():
+        raise OSError("down")
+
+    with pytest.raises(OSError):
+        asyncio.run(retry_async(always_down, [0.0, 0.0]))
+
+def test_simulations():
+    clean = simulate_checkpoints([250, 500, 750], 1000, checkpoint_cost=2, failure_rate=0, trials=3)
+    assert clean == {"wall_time": 1006, "lost_work": 0, "overhead": 6,
+                     "recovery_time": 0, "failures": 0}
+    faulty = simulate_checkpoints([250, 500, 750], 1000, failure_rate=0.002, trials=200)
+    assert faulty["failures"] > 0
+    assert math.isclose(faulty["recovery_time"], faulty["lost_work"] + 5 * faulty["failures"])
+    assert simulate_retries([1.0] * 3, outage=100.0, trials=200)["gave_up"] > 0.9
+    result = compare(trials=100)
+    assert set(result) == {"coralia", "linear", "exponential"}
+    assert result["coralia"]["checkpoint"]["overhead"] == result["linear"]["checkpoint"]["overhead"] == 10
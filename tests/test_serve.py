@@ -0,0 +1,76 @@
+import asyncio
+
+from coralia import C, coherence_score, detect_zone, serve
+from coralia.serve import Server, fetch, load
+
+
+def run(test, path=None, **options):
+    async def main():
+        server = Server(**options)
+        listener = await server.start(port=0, path=path)
+        port = None if path else listener.sockets[0].getsockname()[1]
+        try:
+            return await test(server, {"port": port, "path": path})
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            await server.close()
+    return asyncio.run(main())
+
+def test_endpoints():
+    async def test(server, where):
+        status, body = await fetch("/coherence", {"values": C}, **where)
+        assert (status, body) == (200, coherence_score(C))
+        status, body = await fetch("/zones", {"values": [1, 10, 40], "ceiling": 70}, **where)
+        assert body == {"zones": [detect_zone(x, 70) for x in (1, 10, 40)]}
+        status, body = await fetch("/gap_match", {"values": [4]}, **where)
+        assert body == {"score": 0, "error": "Sequence too short"}
+        assert (await fetch("/zones", {"values": "x"}, **where))[0] == 400
+        assert (await fetch("/zones", {"values": [1], "ceiling": 0}, **where))[0] == 400
+        assert (await fetch("/nowhere", {"values": []}, **where))[0] == 404
+        assert (await fetch("/coherence", **where))[0] == 405
+    run(test)
+
+def test_concurrent_requests_are_batched():
+    async def test(server, where):
+        payloads = [{"values": C[:k], "ceiling": k + 1} for k in range(1, 13)] * 4
+        replies = await asyncio.gather(*(fetch("/zones", p, **where) for p in payloads))
+        assert [r[1]["zones"] for r in replies] == \
+            [[detect_zone(x, p["ceiling"]) for x in p["values"]] for p in payloads]
+        result = await load(200, 20, **where)
+        assert result["status"] == {200: 200}
+        metrics = (await fetch("/metrics", **where))[1]["endpoints"]
+        assert metrics["/zones"]["requests"] == 48
+        assert metrics["/coherence"]["batches"] < metrics["/coherence"]["requests"] == 200
+    run(test, budget=0.01)
+
+def test_bad_payload_fails_alone(monkeypatch):
+    def fragile(payloads):
+        if any(-1 in p["values"] for p in payloads):
+            raise ValueError("negative")
+        return [{"n": len(p["values"])} for p in payloads]
+
+    monkeypatch.setitem(serve.endpoints, "/gap_match", fragile)
+
+    async def test(server, where):
+        payloads = [{"values": [1, 2]}, {"values": [-1]}, {"values": [3]}]
+        replies = await asyncio.gather(*(fetch("/gap_match", p, **where) for p in payloads))
+        assert replies == [(200, {"n": 2}), (500, {"error": "negative"}), (200, {"n": 1})]
+        metrics = server.metrics()["endpoints"]["/gap_match"]
+        assert metrics["batches"] == 1 and metrics["errors"] == 1
+    run(test, budget=0.05)
+
+def test_backpressure():
+    async def test(server, where):
+        result = await load(100, 20, **where)
+        assert result["status"].get(503, 0) > 0
+        assert server.metrics()["endpoints"]["/coherence"]["rejected"] == result["status"][503]
+    run(test, budget=0.01, max_batch=1, max_pending=1)
+
+def test_metrics_before_start():
+    assert Server().metrics() == {"uptime": 0.0, "endpoints": {}}
+
+def test_unix_socket(tmp_path):
+    async def test(server, where):
+        return await fetch("/coherence", {"values": C}, **where)
+    assert run(test, path=str(tmp_path / "coralia.sock"))[0] == 200
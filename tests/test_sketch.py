@@ -0,0 +1,63 @@
+import math
+import random
+
+from coralia import C, convergence_points, detect_zone, gap_match
+from coralia.sketch import QuantileSketch, ZoneSketch
+
+rng = random.Random(21)
+DATA = [rng.lognormvariate(2.5, 0.6) for _ in range(20000)] + [-3.0, 0.0, float("nan")]
+
+
+def chunks(values, size=1000):
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+def test_zone_counts_exact(backend):
+    s = ZoneSketch(ceiling=50)
+    for chunk in chunks(DATA):
+        s.update(chunk)
+    assert s.counts == [sum(detect_zone(x, 50) == k for x in DATA) for k in (1, 2, 3, 4)]
+    assert len(s.values[3]) == s.counts[3] - 1  # NaN is counted but not sketched
+
+def test_quantiles_within_accuracy(backend):
+    s = QuantileSketch(relative_accuracy=0.01)
+    s.extend(DATA)
+    ordered = sorted(x for x in DATA if x == x)
+    for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.999, 1.0):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert math.isclose(s.quantile(q), exact, rel_tol=0.0101, abs_tol=1e-12)
+
+def test_merge_and_bytes_round_trip(backend):
+    whole = ZoneSketch()
+    parts = [ZoneSketch() for _ in range(3)]
+    for i, chunk in enumerate(chunks(DATA)):
+        whole.update(chunk, gaps=True)
+        parts[i % 3].update(chunk, gaps=True)
+    merged = ZoneSketch.from_bytes(parts[0].to_bytes())
+    for p in parts[1:]:
+        merged.merge(ZoneSketch.from_bytes(p.to_bytes()))
+    assert merged.counts == whole.counts
+    for a, b in zip(merged.values + merged.gaps, whole.values + whole.gaps):
+        assert (a.positive, a.negative, a.zero, a.count) == (b.positive, b.negative, b.zero, b.count)
+    assert len(merged.to_bytes()) < 20000
+
+def test_fraction_above_cliff(backend):
+    s = ZoneSketch()
+    s.update(DATA)
+    values = [x for x in DATA if x == x]
+    for x in (15, convergence_points["lambda_2"]["value"], 30):
+        exact = (sum(v > x for v in values) + 1) / len(DATA)  # NaN sits in zone 4
+        assert math.isclose(s.fraction_above(x), exact, rel_tol=0.01)
+    assert s.fraction_above(15) == sum(v > 15 for v in DATA + [math.inf]) / len(DATA)
+
+def test_gaps_follow_gap_match(backend):
+    s = ZoneSketch()
+    s.update(C, gaps=True)
+    assert [g.count for g in s.gaps] == [4, 3, 2, 2]  # by zone of the lower value
+    assert s.gap_quantile(1.0) == max(gap_match(C)["input_gaps"])
+    assert s.gap_quantile(0.0, zone=1) == 1
+
+def test_bounded_buckets(backend):
+    s = QuantileSketch(relative_accuracy=0.001, max_buckets=64)
+    s.extend([1.01 ** k for k in range(5000)])
+    assert len(s.positive) <= 64
+    assert math.isclose(s.quantile(0.99), 1.01 ** 4949, rel_tol=0.002)
@@ -0,0 +1,23 @@
+import random
+
+from coralia import C, CoherenceStream, coherence_score
+
+
+def test_bounded_window_matches_coherence_score():
+    rng = random.Random(3)
+    data = [rng.randint(0, 40) for _ in range(400)]
+    stream = CoherenceStream(window=25)
+    assert stream.snapshot() == coherence_score([])
+    for i, x in enumerate(data):
+        stream.push(x)
+        assert stream.snapshot() == coherence_score(data[max(0, i - 24):i + 1])
+
+def test_push_many_coralia():
+    stream = CoherenceStream(window=12)
+    stream.push_many([99, 98] + C)
+    assert stream.snapshot()["score"] == 1.0
+
+def test_decay_one_averages_every_step():
+    stream = CoherenceStream(window=12, decay=1)
+    stream.push_many(C)
+    assert stream.snapshot()["element_score"] == 1.0
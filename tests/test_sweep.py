@@ -0,0 +1,23 @@
+import json
+
+from coralia.sweep import make_shards, sweep
+
+
+def test_shards_are_deterministic():
+    assert make_shards([36, 35], [12, 11], 3) == [[(35, 11), (35, 12), (36, 11)], [(36, 12)]]
+
+def test_sweep_counts_canonical():
+    assert sweep([35], [12]) == {(35, 12): 1}
+
+def test_sweep_resumes_from_checkpoint(tmp_path):
+    path = tmp_path / "sweep.jsonl"
+    full = sweep(range(20, 30), range(5, 9), str(path), shard_size=7, seed=[])
+    lines = path.read_text().splitlines()
+    path.write_text("\n".join(lines[:3]) + '\n{"shard": 4, "cou')
+    seen = []
+    resumed = sweep(range(20, 30), range(5, 9), str(path), workers=2, shard_size=7,
+                    progress=lambda done, total, rate, eta: seen.append(done), seed=[])
+    assert resumed == full
+    assert seen[0] == 3 and seen[-1] == 6
+    assert len(path.read_text().splitlines()) == 1 + 6
+    assert json.loads(lines[0])["params"] == {"seed": []}
@@ -0,0 +1,103 @@
+import mmap
+import random
+from array import array
+
+import pytest
+
+from coralia import C, coherence_score, detect_zone, detect_zones, find_gap_pattern, gap_match, rolling_gap_match
+
+VALUES = [-1, 0, 3, 3.0001, 6.25, 9, 12, 15, 15.5, 17.944, 35, 70, float("nan")]
+
+
+def test_detect_zones_matches_scalar(backend):
+    assert list(detect_zones(VALUES)) == [detect_zone(x) for x in VALUES]
+
+def test_detect_zones_ceiling(backend):
+    assert list(detect_zones(VALUES, ceiling=100)) == [detect_zone(x, 100) for x in VALUES]
+
+def test_detect_zones_per_element_ceiling(backend):
+    ceilings = [35, 100, 10, 35, 50, 1, 35, 43, 35, 20, 70, 35, 35]
+    expected = [detect_zone(x, c) for x, c in zip(VALUES, ceilings)]
+    assert list(detect_zones(VALUES, ceiling=ceilings)) == expected
+
+def test_detect_zones_bad_ceiling(backend):
+    for ceiling in ([35, 35], [35], 0, [35, 0, 35]):
+        with pytest.raises(ValueError):
+            detect_zones([1, 2, 3], ceiling)
+
+def test_detect_zones_int8(backend):
+    z = detect_zones(range(36))
+    assert z.itemsize == 1
+
+def test_rolling_gap_match_matches_gap_match(backend):
+    rng = random.Random(7)
+    series = [rng.randint(0, 40) for _ in range(300)] + [rng.random() * 50 for _ in range(300)]
+    for window, step in [(1, 1), (2, 1), (12, 1), (30, 7), (20, 45)]:
+        expected = [gap_match(series[i:i + window])["score"]
+                    for i in range(0, len(series) - window + 1, step)]
+        assert list(rolling_gap_match(series, window, step)) == expected
+
+def test_rolling_gap_match_coralia():
+    assert list(rolling_gap_match(C, 12)) == [1.0]
+
+def test_find_gap_pattern_locates_embedded_c(backend):
+    rng = random.Random(4)
+    noise = sorted(rng.uniform(0, 1000) for _ in range(400))
+    planted = [1000 + 3 * x for x in C]
+    series = noise + planted + [1200 + rng.uniform(0, 500) for _ in range(300)]
+    best = find_gap_pattern(series, top_k=3)
+    assert best[0] == {"offset": 400, "scale": 3.0, "score": 1.0}
+    assert best[1]["score"] <= 1.0
+
+def test_find_gap_pattern_matches_gap_match(backend):
+    rng = random.Random(6)
+    series = [rng.randint(0, 60) + 60 * i for i in range(200)]
+    result = find_gap_pattern(series, top_k=1000)
+    assert len(result) == 189
+    assert [r["offset"] for r in result[:1]] == [max(range(189), key=lambda i: (gap_match(series[i:i + 12])["score"], -i))]
+    assert all(r["score"] == gap_match(series[r["offset"]:r["offset"] + 12])["score"] for r in result)
+
+def test_find_gap_pattern_without_scale(backend):
+    assert find_gap_pattern([3 * x for x in C], allow_scale=False)[0]["scale"] == 1.0
+    assert find_gap_pattern(C, allow_scale=False)[0]["score"] == 1.0
+
+def test_find_gap_pattern_without_scale_large_gaps(backend):
+    series = [0, 100, 250, 400, 600, 800, 1000, 1300, 1600, 2000, 2500, 3000, 3500, 4100]
+    result = find_gap_pattern(series, top_k=5, allow_scale=False)
+    assert result == [{"offset": i, "scale": 1.0, "score": 0.0} for i in range(3)]
+
+def test_buffer_inputs_match_lists(backend):
+    rng = random.Random(17)
+    for n in (12, 600):
+        values = [rng.uniform(0, 40) for _ in range(n)]
+        buf = array("d", values)
+        raw = mmap.mmap(-1, 8 * n)
+        raw.write(buf.tobytes())
+        for data in (buf, memoryview(buf), memoryview(raw).cast("d")):
+            assert gap_match(data) == gap_match(values)
+            assert coherence_score(data) == coherence_score(values)
+            assert list(detect_zones(data)) == list(detect_zones(values))
+            assert find_gap_pattern(data) == find_gap_pattern(values)
+        assert list(rolling_gap_match(buf, 30, 5)) == list(rolling_gap_match(values, 30, 5))
+
+def test_narrow_buffers(backend):
+    buf = array("b", [-100, -90, -80, 100, 110, 120])
+    assert find_gap_pattern(buf, 1) == [{"offset": 0, "scale": 22.5, "score": 0.719}]
+    assert gap_match(buf)["score"] == gap_match(list(buf))["score"] == 0.719
+
+def test_find_gap_pattern_takes_iterables(backend):
+    assert find_gap_pattern(x for x in C) == find_gap_pattern(C)
+    assert find_gap_pattern(iter([5])) == []
+
+def test_presorted_skips_sort(backend):
+    rng = random.Random(18)
+    for n in (12, 600):
+        values = sorted(rng.randint(0, 4000) for _ in range(n))
+        assert gap_match(values, presorted=True) == gap_match(values)
+        assert coherence_score(array("l", values), presorted=True) == coherence_score(values)
+        assert find_gap_pattern(values, presorted=True) == find_gap_pattern(values)
+    for window, step in [(1, 1), (2, 1), (12, 1), (30, 7), (20, 45)]:
+        assert list(rolling_gap_match(values, window, step, presorted=True)) == \
+            list(rolling_gap_match(values, window, step))
+    # Trusted, not checked: unsorted input gives a different answer
+    assert gap_match(C[::-1], presorted=True)["score"] != 1.0
@@ -0,0 +1,60 @@
+import random
+from itertools import combinations
+
+from coralia import C, check_axioms, check_axioms_batch, solve_axioms, verify_uniqueness
+from coralia.verify import axiom_names, fib_luc
+
+
+def brute_force(ceiling, cardinality, terminal, seed):
+    fl = fib_luc(ceiling)
+    head = cardinality - 1 - terminal
+    for middle in combinations(range(1, ceiling), cardinality - 2):
+        s = [0, *middle, ceiling]
+        g = [s[i+1] - s[i] for i in range(cardinality - 1)]
+        t = g[head:]
+        if (cardinality in s and set(seed) <= set(s)
+                and all(x in {1, 2, 3} for x in g[:head]) and g[:head] == sorted(g[:head])
+                and all(a > b for a, b in zip(t, t[1:]))
+                and all(x in fl and x >= 3 for x in t)):
+            yield s
+
+
+def test_canonical_parameters_match_verifier():
+    assert verify_uniqueness()
+    assert list(solve_axioms()) == [C]
+
+def test_matches_brute_force():
+    for ceiling in range(6, 20):
+        for cardinality in range(3, 8):
+            for terminal in range(min(3, cardinality)):
+                for seed in [(), (2,)]:
+                    expected = list(brute_force(ceiling, cardinality, terminal, seed))
+                    assert sorted(solve_axioms(ceiling, cardinality, terminal=terminal,
+                                               terminal_min=3, seed=seed)) == expected
+
+def test_large_ceiling():
+    solutions = list(solve_axioms(ceiling=1000, cardinality=500, seed=()))
+    assert len(solutions) == len({tuple(s) for s in solutions}) > 1000
+    assert all(s[-1] == 1000 and len(s) == 500 and 500 in s for s in solutions)
+
+
+def candidates():
+    rng = random.Random(11)
+    rows = [list(C), [0, 1, 2, 3, 5, 7, 9, 12, 15, 22, 30, 35], list(range(12))]
+    for _ in range(300):
+        row = list(C)
+        for _ in range(rng.randint(0, 2)):
+            row[rng.randrange(12)] = rng.randint(0, 40)
+        rows.append(row)
+    return rows
+
+def test_check_axioms_batch_matches_scalar(backend):
+    rows = candidates()
+    expected = [[check_axioms(r)[name] for name in axiom_names] for r in rows]
+    assert [list(map(bool, r)) for r in check_axioms_batch(rows, per_axiom=True)] == expected
+    assert list(check_axioms_batch(rows)) == [all(r) for r in expected]
+    assert list(check_axioms_batch(rows, short_circuit=True)) == [all(r) for r in expected]
+
+def test_check_axioms_batch_short_circuit_columns(backend):
+    rows = [[1, 2, 3, 4, 5, 7, 9, 12, 15, 23, 30, 35]]
+    assert list(map(bool, check_axioms_batch(rows, per_axiom=True, short_circuit=True)[0])) == [False] * 11